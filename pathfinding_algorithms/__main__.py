@@ -1,10 +1,6 @@
-import tkinter as tk
+import sys
 
-from .menu import MenuWindow
+from .cli import main
 
 
-root = tk.Tk()
-p = tk.PhotoImage(file="images/icon.png")
-root.iconphoto(False, p)
-MenuWindow(root).pack()
-root.mainloop()
+sys.exit(main())
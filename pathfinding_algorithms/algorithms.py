@@ -0,0 +1,834 @@
+""" Pathfinding algorithms that run without a graphical interface. """
+import heapq
+import mmap
+import time
+from array import array
+from collections import deque
+
+from .grid import Grid
+
+
+# Cell states of the text maze format
+STATE_START = 'S'
+STATE_GOAL = 'G'
+STATE_BLOCKED = 'X'
+
+# Digits give the weight of entering a cell. Empty cells ('0') and other states weigh 1
+WEIGHTS = "123456789"
+
+# Algorithm names, including the ones displayed in the menu
+ALIASES = {
+    "Breadth-first search (BFS)": "bfs",
+    "Depth-first search (DFS)": "dfs",
+    "Dijkstra's algorithm": "dijkstra",
+    "Greedy best-first search (GBFS)": "gbfs",
+    "A*": "a*",
+    "Jump point search (JPS)": "jps",
+    "Bidirectional BFS": "bidirectional-bfs",
+    "Bidirectional A*": "bidirectional-a*",
+}
+
+# Weight of entering a cell of each state, 0 if blocked
+WEIGHT_TABLE = bytearray([1]) * 256
+WEIGHT_TABLE[ord(STATE_BLOCKED)] = 0
+WEIGHT_TABLE[ord(WEIGHTS[0]):ord(WEIGHTS[-1]) + 1] = bytes(range(1, len(WEIGHTS) + 1))
+
+# Largest value of a distance array
+INFINITY = 2 ** 31 - 1
+
+
+class SearchStats:
+    """ Counters and phase timings of a search. """
+    def __init__(self, expanded=0, generated=0, pushes=0, pops=0, max_frontier=0, closed=0):
+        """
+        Initializes the search statistics.
+
+        Args:
+            expanded (int, optional): Number of expanded nodes. Defaults to 0.
+            generated (int, optional): Number of distinct nodes added to the frontier. Defaults to 0.
+            pushes (int, optional): Number of insertions into the frontier, counting nodes pushed again. Defaults to 0.
+            pops (int, optional): Number of removals from the frontier, counting outdated entries. Defaults to 0.
+            max_frontier (int, optional): Largest size reached by the frontier. Defaults to 0.
+            closed (int, optional): Size of the closed set, which only grows, at the end of the search. Defaults to 0.
+        """
+        self.expanded = expanded
+        self.generated = generated
+        self.pushes = pushes
+        self.pops = pops
+        self.max_frontier = max_frontier
+        self.closed = closed
+
+        # Seconds spent building the layout ("layout"), searching ("search") and walking the path back ("path")
+        self.times = {}
+
+    def as_dict(self):
+        """ Gets the counters and timings as a flat dictionary, e.g. for a metrics pipeline. """
+        stats = {
+            "expanded": self.expanded,
+            "generated": self.generated,
+            "pushes": self.pushes,
+            "pops": self.pops,
+            "max_frontier": self.max_frontier,
+            "closed": self.closed,
+        }
+        for phase, seconds in self.times.items():
+            stats["{}_time".format(phase)] = seconds
+        return stats
+
+    def __repr__(self):
+        return "SearchStats({})".format(", ".join("{}={}".format(key, value) for key, value in self.as_dict().items()))
+
+
+class SearchResult:
+    """ Outcome of a search. """
+    def __init__(self, algorithm, path, cost, expanded, max_frontier, stats=None):
+        """
+        Initializes the search result.
+
+        Args:
+            algorithm (str): Name of the algorithm used.
+            path (list): Cells (row, col) from start to goal. Empty if there is no path.
+            cost (int): Cost of the path. None if there is no path.
+            expanded (int): Number of expanded nodes.
+            max_frontier (int): Largest size reached by the frontier.
+            stats (SearchStats, optional): Detailed counters and timings. Defaults to the expansions and peak frontier only.
+        """
+        self.algorithm = algorithm
+        self.path = path
+        self.cost = cost
+        self.expanded = expanded
+        self.max_frontier = max_frontier
+        self.stats = stats if stats is not None else SearchStats(expanded=expanded, max_frontier=max_frontier)
+
+    @property
+    def found(self):
+        """ Whether a path was found. """
+        return bool(self.path)
+
+    @property
+    def start(self):
+        """ Start cell (row, col) of the path, None if there is no path. """
+        return self.path[0] if self.path else None
+
+    @property
+    def goal(self):
+        """ Goal cell (row, col) reached by the path, None if there is no path. """
+        return self.path[-1] if self.path else None
+
+    def __repr__(self):
+        return "SearchResult(algorithm={!r}, length={}, cost={}, expanded={}, max_frontier={})".format(
+            self.algorithm, len(self.path), self.cost, self.expanded, self.max_frontier)
+
+
+class Layout:
+    """ Flat representation of a maze surrounded by a border of blocked cells. """
+    def __init__(self, grid):
+        """
+        Initializes the layout.
+
+        Args:
+            grid (Grid or list): Maze grid or rows of cell states.
+        """
+        if not isinstance(grid, Grid):
+            grid = Grid.from_rows(grid)
+        self.rows = grid.rows
+        self.columns = grid.columns
+        self.stride = self.columns + 2
+
+        # Weight of entering each cell, 0 if blocked
+        self.table = WEIGHT_TABLE
+        border = bytes(self.stride)
+        self.weights = bytearray(border)
+        for row in range(self.rows):
+            self.weights += b'\x00' + grid.row(row).translate(self.table) + b'\x00'
+        self.weights += border
+
+    @classmethod
+    def load(cls, name, rows, columns):
+        """
+        Maps weights saved with save into memory. Processes mapping the same file share its pages.
+
+        Changes to the weights stay private to the layout.
+        """
+        layout = cls.__new__(cls)
+        layout.rows = rows
+        layout.columns = columns
+        layout.stride = columns + 2
+        layout.table = WEIGHT_TABLE
+        with open(name, 'rb') as file:
+            layout.weights = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        if len(layout.weights) != (rows + 2) * layout.stride:
+            raise ValueError("{} does not hold the weights of a {}x{} maze".format(name, rows, columns))
+        return layout
+
+    def save(self, name):
+        """ Saves the weights, including the border, as a binary file. """
+        with open(name, 'wb') as file:
+            file.write(self.weights)
+
+    def index(self, node):
+        """ Gets flat index of a node (row, col). """
+        return (node[0] + 1) * self.stride + node[1] + 1
+
+    def check(self, node):
+        """ Raises ValueError if a node (row, col) is outside the maze. """
+        if not (0 <= node[0] < self.rows and 0 <= node[1] < self.columns):
+            raise ValueError("Cell {} is outside the {}x{} maze".format(tuple(node), self.rows, self.columns))
+
+    def node(self, index):
+        """ Gets node (row, col) of a flat index. """
+        row, col = divmod(index, self.stride)
+        return (row - 1, col - 1)
+
+    def set_state(self, node, state):
+        """ Updates the weight of a node after its state changed. """
+        self.weights[self.index(node)] = self.table[ord(str(state))]
+
+    def neighbors(self):
+        """ Gets index offsets of the available actions (up, down, left, right). """
+        return (-self.stride, self.stride, -1, 1)
+
+    def max_weight(self):
+        """ Gets the largest weight of a cell, 0 if every cell is blocked. """
+        for weight in range(len(WEIGHTS), 0, -1):
+            if self.weights.find(bytes([weight])) != -1:
+                return weight
+        return 0
+
+    def is_uniform(self):
+        """ Checks whether every open cell has weight 1. """
+        return self.max_weight() <= 1
+
+
+def solve(grid, start, goal, algorithm="a*", cost=1, on_expand=None, on_visit=None, reachability=None):
+    """
+    Finds a path between two cells of a maze.
+
+    Args:
+        grid (Grid, list or Layout): Maze grid or rows of cell states.
+        start (tuple): Start cell (row, col).
+        goal (tuple): Goal cell (row, col).
+        algorithm (str, optional): One of the ALGORITHMS or a menu name. Defaults to "a*".
+        cost (int, optional): Cost of moving into a cell of weight 1. Cells weighing more cost a multiple of it. Defaults to 1.
+        on_expand (callable, optional): Called with each expanded cell. Defaults to None.
+        on_visit (callable, optional): Called with each cell added to the frontier. Defaults to None.
+        reachability (ReachabilityIndex, optional): Components of the maze. Cells in different components
+            have no path, which is returned without searching. Defaults to None.
+
+    Returns:
+        SearchResult: Path found and search statistics, detailed in its stats. Empty if the start or the goal is blocked.
+
+    Raises:
+        ValueError: If the algorithm is unknown or the start or the goal is outside the maze.
+    """
+    name = ALIASES.get(algorithm, algorithm)
+    if name not in ALGORITHMS:
+        raise ValueError("Unknown algorithm: {}".format(algorithm))
+    if reachability is not None and not reachability.connected(start, goal):
+        return SearchResult(name, [], None, 0, 0)
+    begin = time.perf_counter()
+    layout = grid if isinstance(grid, Layout) else Layout(grid)
+    layout.check(start)
+    layout.check(goal)
+    source = layout.index(start)
+    target = layout.index(goal)
+    if not layout.weights[source] or not layout.weights[target]:
+        return SearchResult(name, [], None, 0, 0)
+    searched = time.perf_counter()
+
+    parents, stats = ALGORITHMS[name](layout, source, target, on_expand, on_visit)
+    walked = time.perf_counter()
+
+    path = walk(parents, target) if parents is not None else []
+    total_cost = sum(layout.weights[index] for index in path[1:]) * cost if path else None
+    stats.times = {"layout": searched - begin, "search": walked - searched, "path": time.perf_counter() - walked}
+    return SearchResult(name, [layout.node(index) for index in path], total_cost, stats.expanded, stats.max_frontier, stats)
+
+
+def walk(parents, target):
+    """ Walks parents back from the goal, returning the path of flat indices from the start. """
+    path = []
+    current = target
+    while current != -1:
+        path.append(current)
+        current = parents[current]
+    path.reverse()
+    return path
+
+
+def breadth_first_search(layout, source, target, on_expand=None, on_visit=None):
+    """ Runs the BFS algorithm. Returns the parent array (None if unreachable) and SearchStats. """
+    parents, _, stats = multi_source_breadth_first_search(layout, [source], [target], on_expand, on_visit)
+    return parents, stats
+
+
+def multi_source_breadth_first_search(layout, sources, targets, on_expand=None, on_visit=None):
+    """
+    Runs the BFS algorithm from all the sources at once until reaching the nearest target.
+
+    Returns:
+        tuple: Parent array (None if unreachable), target reached (-1 if none) and SearchStats.
+    """
+    weights = layout.weights
+    offsets = layout.neighbors()
+    parents = array('i', [-1]) * len(weights)
+    seen = bytearray(len(weights))
+    is_target = bytearray(len(weights))
+    for target in targets:
+        is_target[target] = 1
+    frontier = deque()
+    for source in sources:
+        if not seen[source]:
+            seen[source] = 1
+            frontier.append(source)
+    generated = len(frontier)
+    expanded = max_frontier = 0
+    while frontier:
+        if len(frontier) > max_frontier:
+            max_frontier = len(frontier)
+        current = frontier.popleft()
+        if is_target[current]:
+            return parents, current, SearchStats(expanded, generated, generated, expanded + 1, max_frontier, expanded)
+        expanded += 1
+        if on_expand is not None:
+            on_expand(layout.node(current))
+        for offset in offsets:
+            nxt = current + offset
+            if weights[nxt] and not seen[nxt]:
+                seen[nxt] = 1
+                parents[nxt] = current
+                frontier.append(nxt)
+                generated += 1
+                if on_visit is not None:
+                    on_visit(layout.node(nxt))
+    return None, -1, SearchStats(expanded, generated, generated, expanded, max_frontier, expanded)
+
+
+def depth_first_search(layout, source, target, on_expand=None, on_visit=None):
+    """ Runs the DFS algorithm. Returns the parent array (None if unreachable) and SearchStats. """
+    weights = layout.weights
+    offsets = layout.neighbors()
+    parents = array('i', [-1]) * len(weights)
+    seen = bytearray(len(weights))
+    seen[source] = 1
+    frontier = [source]
+    generated = 1
+    expanded = max_frontier = 0
+    while frontier:
+        if len(frontier) > max_frontier:
+            max_frontier = len(frontier)
+        current = frontier.pop()
+        if current == target:
+            return parents, SearchStats(expanded, generated, generated, expanded + 1, max_frontier, expanded)
+        expanded += 1
+        if on_expand is not None:
+            on_expand(layout.node(current))
+        for offset in offsets:
+            nxt = current + offset
+            if weights[nxt] and not seen[nxt]:
+                seen[nxt] = 1
+                parents[nxt] = current
+                frontier.append(nxt)
+                generated += 1
+                if on_visit is not None:
+                    on_visit(layout.node(nxt))
+    return None, SearchStats(expanded, generated, generated, expanded, max_frontier, expanded)
+
+
+def best_first_search(layout, source, target, on_expand=None, on_visit=None, use_cost=True, use_heuristic=True):
+    """
+    Runs a best-first search on a binary heap with lazy deletion of outdated entries.
+
+    Nodes are ordered by the path cost (Dijkstra), the Manhattan distance to the goal (GBFS) or both (A*).
+    Ties are broken in favour of nodes closer to the goal.
+    """
+    weights = layout.weights
+    offsets = layout.neighbors()
+    stride = layout.stride
+    goal_row, goal_col = divmod(target, stride)
+    parents = array('i', [-1]) * len(weights)
+    distances = array('i', [INFINITY]) * len(weights)
+    closed = bytearray(len(weights))
+    distances[source] = 0
+    frontier = [(0, 0, source)]
+    generated = pushes = 1
+    expanded = max_frontier = 0
+    while frontier:
+        if len(frontier) > max_frontier:
+            max_frontier = len(frontier)
+        _, _, current = heapq.heappop(frontier)
+        if closed[current]:
+            continue
+        if current == target:
+            return parents, SearchStats(expanded, generated, pushes, pushes - len(frontier), max_frontier, expanded)
+        closed[current] = 1
+        expanded += 1
+        if on_expand is not None:
+            on_expand(layout.node(current))
+        distance = distances[current]
+        for offset in offsets:
+            nxt = current + offset
+            weight = weights[nxt]
+            if not weight or closed[nxt]:
+                continue
+            new_distance = distance + weight
+            is_new = distances[nxt] == INFINITY
+            if is_new or (use_cost and new_distance < distances[nxt]):
+                if is_new:
+                    generated += 1
+                    if on_visit is not None:
+                        on_visit(layout.node(nxt))
+                distances[nxt] = new_distance
+                parents[nxt] = current
+                if use_heuristic:
+                    row, col = divmod(nxt, stride)
+                    heuristic = abs(goal_row - row) + abs(goal_col - col)
+                else:
+                    heuristic = 0
+                priority = (new_distance if use_cost else 0) + heuristic
+                heapq.heappush(frontier, (priority, heuristic, nxt))
+                pushes += 1
+    return None, SearchStats(expanded, generated, pushes, pushes, max_frontier, expanded)
+
+
+def bucket_search(layout, source, target, on_expand=None, on_visit=None, use_heuristic=True):
+    """ Runs a best-first search on a bucket queue. Returns the parent array (None if unreachable) and SearchStats. """
+    parents, _, stats = multi_source_bucket_search(layout, [source], [target], on_expand, on_visit, use_heuristic)
+    return parents, stats
+
+
+def multi_source_bucket_search(layout, sources, targets, on_expand=None, on_visit=None, use_heuristic=True, heuristics=None):
+    """
+    Runs a best-first search from all the sources at once, ordered by path cost, plus the Manhattan distance to the
+    nearest target, on a bucket queue (Dial's algorithm).
+
+    Each step raises the priority by at most the largest cell weight plus one, so the frontier fits in
+    a circular array of that many buckets, indexed by priority, with constant-time pushes and pops.
+    Outdated entries are skipped when popped. Ties are broken in favour of the latest node pushed.
+
+    Args:
+        heuristics (sequence, optional): Distance to the nearest target of each flat index. Required with
+            several targets if use_heuristic is set. Defaults to the Manhattan distance to the only target.
+
+    Returns:
+        tuple: Parent array (None if unreachable), target reached (-1 if none) and SearchStats.
+    """
+    weights = layout.weights
+    offsets = layout.neighbors()
+    stride = layout.stride
+    if use_heuristic and heuristics is None and len(targets) > 1:
+        raise ValueError("Heuristics of several targets must be given")
+    goal_row, goal_col = divmod(targets[0], stride) if targets else (0, 0)
+    parents = array('i', [-1]) * len(weights)
+    distances = array('i', [INFINITY]) * len(weights)
+    closed = bytearray(len(weights))
+    is_target = bytearray(len(weights))
+    for target in targets:
+        is_target[target] = 1
+    span = layout.max_weight() + 2
+    buckets = [[] for _ in range(span)]
+
+    priorities = []
+    for source in sources:
+        distances[source] = 0
+        if heuristics is not None:
+            priorities.append(heuristics[source])
+        elif use_heuristic:
+            row, col = divmod(source, stride)
+            priorities.append(abs(goal_row - row) + abs(goal_col - col))
+        else:
+            priorities.append(0)
+    if not sources:
+        return None, -1, SearchStats()
+
+    # Sources wait until their priority is reached, so the queue never holds priorities further apart
+    # than the buckets
+    waiting = sorted(zip(priorities, sources), reverse=True)
+    priority = waiting[-1][0]
+    generated = pushes = len(sources)
+    queued = expanded = max_frontier = 0
+    while queued or waiting:
+        if not queued:
+            priority = waiting[-1][0]
+        while waiting and waiting[-1][0] == priority:
+            buckets[priority % span].append(waiting.pop()[1])
+            queued += 1
+        bucket = buckets[priority % span]
+        priority += 1
+
+        # Expand nodes of the lowest priority, including the ones pushed meanwhile
+        while bucket:
+            current = bucket.pop()
+            queued -= 1
+            if closed[current]:
+                continue
+            if is_target[current]:
+                return parents, current, SearchStats(expanded, generated, pushes, pushes - queued, max_frontier, expanded)
+            closed[current] = 1
+            expanded += 1
+            if on_expand is not None:
+                on_expand(layout.node(current))
+            distance = distances[current]
+            for offset in offsets:
+                nxt = current + offset
+                weight = weights[nxt]
+                if not weight or closed[nxt]:
+                    continue
+                new_distance = distance + weight
+                old_distance = distances[nxt]
+                if new_distance < old_distance:
+                    if old_distance == INFINITY:
+                        generated += 1
+                        if on_visit is not None:
+                            on_visit(layout.node(nxt))
+                    distances[nxt] = new_distance
+                    parents[nxt] = current
+                    if heuristics is not None:
+                        buckets[(new_distance + heuristics[nxt]) % span].append(nxt)
+                    elif use_heuristic:
+                        row, col = divmod(nxt, stride)
+                        buckets[(new_distance + abs(goal_row - row) + abs(goal_col - col)) % span].append(nxt)
+                    else:
+                        buckets[new_distance % span].append(nxt)
+                    queued += 1
+                    pushes += 1
+            if queued > max_frontier:
+                max_frontier = queued
+    return None, -1, SearchStats(expanded, generated, pushes, pushes, max_frontier, expanded)
+
+
+def dijkstra(layout, source, target, on_expand=None, on_visit=None):
+    """ Runs the Dijkstra algorithm. """
+    return bucket_search(layout, source, target, on_expand, on_visit, use_heuristic=False)
+
+
+def greedy_best_first_search(layout, source, target, on_expand=None, on_visit=None):
+    """ Runs the GBFS algorithm. """
+    return best_first_search(layout, source, target, on_expand, on_visit, use_cost=False, use_heuristic=True)
+
+
+def a_star(layout, source, target, on_expand=None, on_visit=None):
+    """ Runs the A* algorithm. """
+    return bucket_search(layout, source, target, on_expand, on_visit, use_heuristic=True)
+
+
+# Whether a horizontal move from a node finds a jump point, 0 until checked
+CROSSING = 1
+NOT_CROSSING = 2
+
+# Translation of weights to 1 for open cells and 0 for blocked cells
+OPEN_TABLE = bytes([0]) + bytes([1]) * 255
+
+
+def forced_marks(weights, row, stride, marks):
+    """
+    Marks the nodes of a row with a neighbor above or below that can only be reached optimally through them.
+
+    The whole row is computed at once with bitwise operations on integers holding one byte per node,
+    and kept for the rest of the search.
+
+    Args:
+        marks (dict): Marks of the rows computed so far.
+
+    Returns:
+        tuple: Marks when moving right and when moving left, as bytes where 1 marks a forced neighbor.
+    """
+    known = marks.get(row)
+    if known is None:
+        start = row * stride
+        lanes = int.from_bytes(bytes([1]) * stride, 'little')
+        above = int.from_bytes(weights[start - stride:start].translate(OPEN_TABLE), 'little')
+        below = int.from_bytes(weights[start + stride:start + 2 * stride].translate(OPEN_TABLE), 'little')
+        right = (above & ~(above << 8) | below & ~(below << 8)) & lanes
+        left = (above & ~(above >> 8) | below & ~(below >> 8)) & lanes
+        known = marks[row] = (right.to_bytes(stride, 'little'), left.to_bytes(stride, 'little'))
+    return known
+
+
+def jump_horizontally(weights, current, direction, target, stride, marks):
+    """
+    Moves from a node along its row until reaching a jump point, searching the row with bytes.find.
+
+    Returns:
+        int: Index of the jump point, -1 if a blocked cell is reached first.
+    """
+    start = current - current % stride
+    right, left = forced_marks(weights, start // stride, stride, marks)
+    if direction == 1:
+        wall = weights.find(b'\x00', current + 1)
+        found = right.find(b'\x01', current + 1 - start, wall - start)
+        stop = start + found if found != -1 else -1
+        if current < target < wall and (stop == -1 or target < stop):
+            stop = target
+    else:
+        wall = weights.rfind(b'\x00', start, current)
+        found = left.rfind(b'\x01', wall + 1 - start, current - start)
+        stop = start + found if found != -1 else -1
+        if wall < target < current and target > stop:
+            stop = target
+    return stop
+
+
+def jump(weights, current, direction, target, stride, marks, crossings):
+    """
+    Moves from a node in a direction until reaching a jump point.
+
+    A jump point is the goal or a node with a neighbor that can only be reached optimally through it.
+    Vertical moves also stop where a horizontal move would find a jump point.
+
+    Args:
+        marks (dict): Forced neighbors of the rows searched so far, as computed by forced_marks.
+        crossings (bytearray): Whether a horizontal move from each node finds a jump point, once checked.
+
+    Returns:
+        int: Index of the jump point, -1 if a blocked cell is reached first.
+    """
+    if abs(direction) != stride:
+        return jump_horizontally(weights, current, direction, target, stride, marks)
+    while True:
+        current += direction
+        if not weights[current]:
+            return -1
+        if current == target:
+            return current
+        for side in (-1, 1):
+            if weights[current + side] and not weights[current - direction + side]:
+                return current
+        crossing = crossings[current]
+        if not crossing:
+            found = (jump_horizontally(weights, current, 1, target, stride, marks) != -1
+                     or jump_horizontally(weights, current, -1, target, stride, marks) != -1)
+            crossing = crossings[current] = CROSSING if found else NOT_CROSSING
+        if crossing == CROSSING:
+            return current
+
+
+def jump_point_search(layout, source, target, on_expand=None, on_visit=None):
+    """
+    Runs the JPS algorithm, an A* that only expands jump points of uniform-cost grids.
+
+    The parents of the cells between consecutive jump points of the path are filled in before returning.
+    Mazes with weighted cells have no jump points, so they are solved with the A* algorithm.
+    """
+    if not layout.is_uniform():
+        return a_star(layout, source, target, on_expand, on_visit)
+    weights = layout.weights
+    stride = layout.stride
+    goal_row, goal_col = divmod(target, stride)
+    parents = array('i', [-1]) * len(weights)
+    distances = array('i', [INFINITY]) * len(weights)
+    closed = bytearray(len(weights))
+    marks = {}
+    crossings = bytearray(len(weights))
+    distances[source] = 0
+    frontier = [(0, 0, source)]
+    generated = pushes = 1
+    expanded = max_frontier = 0
+    while frontier:
+        if len(frontier) > max_frontier:
+            max_frontier = len(frontier)
+        _, _, current = heapq.heappop(frontier)
+        if closed[current]:
+            continue
+        if current == target:
+            # Fill in the cells between jump points
+            while current != source:
+                parent = parents[current]
+                step = stride if abs(current - parent) >= stride else 1
+                step = step if current > parent else -step
+                for cell in range(parent + step, current, step):
+                    parents[cell] = cell - step
+                parents[current] = current - step
+                current = parent
+            return parents, SearchStats(expanded, generated, pushes, pushes - len(frontier), max_frontier, expanded)
+        closed[current] = 1
+        expanded += 1
+        if on_expand is not None:
+            on_expand(layout.node(current))
+
+        # Prune directions using the direction of arrival
+        parent = parents[current]
+        if parent == -1:
+            directions = layout.neighbors()
+        elif abs(current - parent) >= stride:
+            direction = stride if current > parent else -stride
+            directions = (direction, -1, 1)
+        else:
+            direction = 1 if current > parent else -1
+            directions = (direction, -stride, stride)
+
+        row, col = divmod(current, stride)
+        for direction in directions:
+            nxt = jump(weights, current, direction, target, stride, marks, crossings)
+            if nxt == -1 or closed[nxt]:
+                continue
+            next_row, next_col = divmod(nxt, stride)
+            new_distance = distances[current] + abs(next_row - row) + abs(next_col - col)
+            old_distance = distances[nxt]
+            if new_distance < old_distance:
+                if old_distance == INFINITY:
+                    generated += 1
+                    if on_visit is not None:
+                        on_visit(layout.node(nxt))
+                distances[nxt] = new_distance
+                parents[nxt] = current
+                heuristic = abs(goal_row - next_row) + abs(goal_col - next_col)
+                heapq.heappush(frontier, (new_distance + heuristic, heuristic, nxt))
+                pushes += 1
+    return None, SearchStats(expanded, generated, pushes, pushes, max_frontier, expanded)
+
+
+def join(parents, children, meeting, target):
+    """ Links the half of a path found from the goal to the half found from the start at the meeting node. """
+    current = meeting
+    while current != target:
+        parents[children[current]] = current
+        current = children[current]
+
+
+def bidirectional_breadth_first_search(layout, source, target, on_expand=None, on_visit=None):
+    """
+    Runs the BFS algorithm from both the start and the goal until the frontiers meet.
+
+    The smaller frontier is expanded one whole layer at a time, keeping the shortest meeting found in the layer.
+    """
+    weights = layout.weights
+    offsets = layout.neighbors()
+    size = len(weights)
+    parents = array('i', [-1]) * size
+    children = array('i', [-1]) * size
+    forward = array('i', [INFINITY]) * size
+    backward = array('i', [INFINITY]) * size
+    forward[source] = 0
+    backward[target] = 0
+    forward_frontier = [source]
+    backward_frontier = [target]
+    generated = 2
+    expanded = max_frontier = 0
+    if source == target:
+        return parents, SearchStats(0, 1, 1, 1, 1, 0)
+    while forward_frontier and backward_frontier:
+        if len(forward_frontier) + len(backward_frontier) > max_frontier:
+            max_frontier = len(forward_frontier) + len(backward_frontier)
+        is_forward = len(forward_frontier) <= len(backward_frontier)
+        if is_forward:
+            layer, distances, other_distances, links = forward_frontier, forward, backward, parents
+        else:
+            layer, distances, other_distances, links = backward_frontier, backward, forward, children
+        best = INFINITY
+        meeting = -1
+        next_layer = []
+        for current in layer:
+            expanded += 1
+            if on_expand is not None:
+                on_expand(layout.node(current))
+            distance = distances[current] + 1
+            for offset in offsets:
+                nxt = current + offset
+                if not weights[nxt] or distances[nxt] != INFINITY:
+                    continue
+                distances[nxt] = distance
+                links[nxt] = current
+                next_layer.append(nxt)
+                generated += 1
+                if on_visit is not None:
+                    on_visit(layout.node(nxt))
+                if other_distances[nxt] != INFINITY and distance + other_distances[nxt] < best:
+                    best = distance + other_distances[nxt]
+                    meeting = nxt
+        if meeting != -1:
+            join(parents, children, meeting, target)
+            return parents, SearchStats(expanded, generated, generated, expanded, max_frontier, expanded)
+        if is_forward:
+            forward_frontier = next_layer
+        else:
+            backward_frontier = next_layer
+    return None, SearchStats(expanded, generated, generated, expanded, max_frontier, expanded)
+
+
+def bidirectional_a_star(layout, source, target, on_expand=None, on_visit=None):
+    """
+    Runs the A* algorithm from both the start and the goal, expanding the smaller frontier each time.
+
+    Both searches use the balanced heuristic, the average of the distance to their own end and
+    minus the distance to the other end, so that they agree on the length of every path.
+    The search stops once the smallest keys of the two frontiers add up to the best path through a meeting node.
+    Keys are doubled to stay integers.
+    """
+    weights = layout.weights
+    offsets = layout.neighbors()
+    stride = layout.stride
+    size = len(weights)
+    parents = array('i', [-1]) * size
+    children = array('i', [-1]) * size
+    forward = array('i', [INFINITY]) * size
+    backward = array('i', [INFINITY]) * size
+    forward_closed = bytearray(size)
+    backward_closed = bytearray(size)
+    forward[source] = 0
+    backward[target] = 0
+    forward_frontier = [(0, 0, source)]
+    backward_frontier = [(0, 0, target)]
+    best = 0 if source == target else INFINITY
+    meeting = source if source == target else -1
+    generated = pushes = 2
+    expanded = max_frontier = 0
+    while forward_frontier and backward_frontier:
+        if len(forward_frontier) + len(backward_frontier) > max_frontier:
+            max_frontier = len(forward_frontier) + len(backward_frontier)
+        if best != INFINITY and forward_frontier[0][0] + backward_frontier[0][0] >= 2 * best:
+            break
+        is_forward = len(forward_frontier) <= len(backward_frontier)
+        if is_forward:
+            frontier, distances, other_distances, closed, links = forward_frontier, forward, backward, forward_closed, parents
+            goal, origin = target, source
+        else:
+            frontier, distances, other_distances, closed, links = backward_frontier, backward, forward, backward_closed, children
+            goal, origin = source, target
+        _, _, current = heapq.heappop(frontier)
+        if closed[current]:
+            continue
+        closed[current] = 1
+        expanded += 1
+        if on_expand is not None:
+            on_expand(layout.node(current))
+        goal_row, goal_col = divmod(goal, stride)
+        origin_row, origin_col = divmod(origin, stride)
+        for offset in offsets:
+            nxt = current + offset
+            if not weights[nxt] or closed[nxt]:
+                continue
+            new_distance = distances[current] + (weights[nxt] if is_forward else weights[current])
+            old_distance = distances[nxt]
+            if new_distance < old_distance:
+                if old_distance == INFINITY:
+                    generated += 1
+                    if on_visit is not None:
+                        on_visit(layout.node(nxt))
+                distances[nxt] = new_distance
+                links[nxt] = current
+                row, col = divmod(nxt, stride)
+                heuristic = abs(goal_row - row) + abs(goal_col - col)
+                balanced = heuristic - abs(origin_row - row) - abs(origin_col - col)
+                heapq.heappush(frontier, (2 * new_distance + balanced, heuristic, nxt))
+                pushes += 1
+                if other_distances[nxt] != INFINITY and new_distance + other_distances[nxt] < best:
+                    best = new_distance + other_distances[nxt]
+                    meeting = nxt
+    stats = SearchStats(expanded, generated, pushes, pushes - len(forward_frontier) - len(backward_frontier), max_frontier, expanded)
+    if meeting == -1:
+        return None, stats
+    join(parents, children, meeting, target)
+    return parents, stats
+
+
+ALGORITHMS = {
+    "bfs": breadth_first_search,
+    "dfs": depth_first_search,
+    "dijkstra": dijkstra,
+    "gbfs": greedy_best_first_search,
+    "a*": a_star,
+    "jps": jump_point_search,
+    "bidirectional-bfs": bidirectional_breadth_first_search,
+    "bidirectional-a*": bidirectional_a_star,
+}
@@ -0,0 +1,76 @@
+""" Solving of many queries on the same maze across processes. """
+import itertools
+import os
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .algorithms import Layout, solve
+from .grid import Grid
+from .reachability import ReachabilityIndex
+
+
+# Layouts and reachability indices already mapped by a worker process, keyed by weights file
+_layouts = {}
+
+
+def _solve_chunk(names, shape, queries, algorithm, cost):
+    """ Solves a chunk of queries inside a worker, mapping the weights and labels files on first use. """
+    weights_name, labels_name = names
+    if weights_name not in _layouts:
+        _layouts.clear()
+        _layouts[weights_name] = (Layout.load(weights_name, *shape), ReachabilityIndex.load(labels_name))
+    layout, reachability = _layouts[weights_name]
+    return [(start, goal, solve(layout, start, goal, algorithm, cost, reachability=reachability)) for start, goal in queries]
+
+
+def solve_many(grid, queries, algorithm="a*", cost=1, workers=None, chunk_size=64):
+    """
+    Solves many (start, goal) queries on one maze using a pool of processes.
+
+    The weights of the maze and the labels of its connected components are computed once and
+    written to temporary files that every worker maps into memory, so they are neither pickled
+    with each task nor copied by each worker. Results are yielded as soon as their chunk is solved.
+
+    Args:
+        grid (Grid or list): Maze grid or rows of cell states.
+        queries (iterable): Pairs of start and goal cells (row, col).
+        algorithm (str, optional): Algorithm to solve the queries. Defaults to "a*".
+        cost (int, optional): Cost of moving from one cell to another adjacent. Defaults to 1.
+        workers (int, optional): Number of processes. Defaults to the number of CPUs.
+        chunk_size (int, optional): Number of queries sent to a worker at once. Defaults to 64.
+
+    Yields:
+        tuple: Start cell, goal cell and SearchResult, in order of completion.
+    """
+    if not isinstance(grid, Grid):
+        grid = Grid.from_rows(grid)
+    workers = workers or os.cpu_count() or 1
+    queries = iter(queries)
+
+    # Share weights and labels through memory-mapped files
+    names = []
+    for suffix in (".weights", ".npy"):
+        descriptor, name = tempfile.mkstemp(suffix=suffix)
+        os.close(descriptor)
+        names.append(name)
+    try:
+        Layout(grid).save(names[0])
+        ReachabilityIndex(grid).save(names[1])
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Keep a bounded number of chunks in flight
+            pending = set()
+            while True:
+                while len(pending) < 2 * workers:
+                    chunk = list(itertools.islice(queries, chunk_size))
+                    if not chunk:
+                        break
+                    pending.add(executor.submit(_solve_chunk, names, (grid.rows, grid.columns), chunk, algorithm, cost))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for item in future.result():
+                        yield item
+    finally:
+        for name in names:
+            os.remove(name)
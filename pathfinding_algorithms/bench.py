@@ -0,0 +1,159 @@
+""" Benchmark of the pathfinding algorithms on seeded random mazes. """
+import argparse
+import csv
+import json
+import sys
+import time
+import tracemalloc
+
+from .algorithms import ALGORITHMS, solve
+from .generators import obstacles
+from .reachability import ReachabilityIndex
+
+
+# Runs faster than this (in seconds) are too noisy to compare times
+MIN_TIME = 0.01
+
+# Seeds tried for each maze before giving up on finding a solvable one
+MAX_ATTEMPTS = 100
+
+FIELDS = ["size", "density", "seed", "algorithm", "found", "path_length", "cost", "expanded", "max_frontier", "time", "peak_memory"]
+
+
+def random_maze(size, density, seed):
+    """
+    Generates a square maze with a fraction density of blocked cells, start at the top left and goal at the bottom right.
+
+    Mazes where the goal cannot be reached measure nothing, so the seed is increased until the goal is reachable.
+
+    Returns:
+        tuple: Maze and the seed it was generated with.
+
+    Raises:
+        ValueError: If none of MAX_ATTEMPTS seeds gives a solvable maze.
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        grid = obstacles(size, size, density, seed + attempt)
+        if ReachabilityIndex(grid).connected((0, 0), (size - 1, size - 1)):
+            return grid, seed + attempt
+    raise ValueError("No solvable {}x{} maze of density {} from seed {} to {}".format(
+        size, size, density, seed, seed + MAX_ATTEMPTS - 1))
+
+
+def run_benchmark(sizes, densities, algorithms, seed=0, memory=True):
+    """
+    Runs every algorithm on a maze of each size and density.
+
+    Args:
+        sizes (list): Number of rows and columns of each maze.
+        densities (list): Fractions of blocked cells.
+        algorithms (list): Algorithms to run.
+        seed (int, optional): First seed tried for each maze. The seed of the solvable maze used is recorded. Defaults to 0.
+        memory (bool, optional): Measure peak memory in an additional traced run. Defaults to True.
+
+    Returns:
+        list: One dictionary of measurements per run.
+    """
+    results = []
+    for size in sizes:
+        for density in densities:
+            grid, maze_seed = random_maze(size, density, seed)
+            start, goal = (0, 0), (size - 1, size - 1)
+            for algorithm in algorithms:
+                begin = time.perf_counter()
+                result = solve(grid, start, goal, algorithm)
+                elapsed = time.perf_counter() - begin
+
+                peak_memory = None
+                if memory:
+                    tracemalloc.start()
+                    solve(grid, start, goal, algorithm)
+                    peak_memory = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+
+                results.append({
+                    "size": size,
+                    "density": density,
+                    "seed": maze_seed,
+                    "algorithm": algorithm,
+                    "found": result.found,
+                    "path_length": len(result.path),
+                    "cost": result.cost,
+                    "expanded": result.expanded,
+                    "max_frontier": result.max_frontier,
+                    "time": round(elapsed, 6),
+                    "peak_memory": peak_memory,
+                })
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """ Lists the runs that are slower or expand more nodes than the baseline by more than a fraction tolerance. """
+    reference = {(row["size"], row["density"], row["algorithm"]): row for row in baseline}
+    regressions = []
+    for row in results:
+        previous = reference.get((row["size"], row["density"], row["algorithm"]))
+        if previous is None:
+            continue
+        for field in ("time", "expanded"):
+            if field == "time" and previous[field] < MIN_TIME:
+                continue
+            if row[field] > previous[field] * (1 + tolerance):
+                regressions.append("{} {}x{} density {}: {} {} -> {}".format(
+                    row["algorithm"], row["size"], row["size"], row["density"], field, previous[field], row[field]))
+    return regressions
+
+
+def write(results, file, output_format):
+    """ Writes results as CSV or JSON. """
+    if output_format == "json":
+        json.dump(results, file, indent=2)
+        file.write("\n")
+    else:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main(args=None):
+    """ Runs the benchmark from the command line. Returns the exit status. """
+    parser = argparse.ArgumentParser(prog="python -m pathfinding_algorithms.bench", description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500, 1000, 2000], help="rows and columns of each maze")
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.0, 0.1, 0.2, 0.3], help="fractions of blocked cells")
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS), choices=list(ALGORITHMS), help="algorithms to run")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random mazes")
+    parser.add_argument("--format", choices=["csv", "json"], default="csv", help="output format")
+    parser.add_argument("--output", help="output file, defaults to standard output")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced run measuring peak memory")
+    parser.add_argument("--save-baseline", help="save results as a JSON baseline")
+    parser.add_argument("--baseline", help="JSON baseline to compare with, exits with status 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown over the baseline")
+    args = parser.parse_args(args)
+
+    try:
+        results = run_benchmark(args.sizes, args.densities, args.algorithms, args.seed, not args.no_memory)
+    except ValueError as error:
+        parser.error(str(error))
+
+    if args.output:
+        with open(args.output, 'w', newline='') as file:
+            write(results, file, args.format)
+    else:
+        write(results, sys.stdout, args.format)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as file:
+            write(results, file, "json")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print("Regression: " + regression, file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+""" Cache of search results keyed by the content of the maze. """
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+
+from .algorithms import ALIASES, solve
+from .grid import Grid
+from .trace import EXPAND, VISIT, Trace
+
+
+def digest(grid):
+    """ Hashes the dimensions and cell states of a grid, once until the grid is written to. """
+    if not isinstance(grid, Grid):
+        grid = Grid.from_rows(grid)
+    if grid.content_digest is None:
+        content = hashlib.blake2b(digest_size=16)
+        content.update("{}x{}".format(grid.rows, grid.columns).encode())
+        content.update(memoryview(grid.cells)[grid.offset:])
+        grid.content_digest = content.hexdigest()
+    return grid.content_digest
+
+
+def replay(trace, on_expand=None, on_visit=None):
+    """ Calls the callbacks of a search with the expansions and visits recorded in a trace. """
+    for kind, node in trace.events():
+        if kind == EXPAND and on_expand is not None:
+            on_expand(node)
+        elif kind == VISIT and on_visit is not None:
+            on_visit(node)
+
+
+class PathCache:
+    """
+    Least recently used cache of search results.
+
+    Searches run with callbacks are recorded with their result, and the recording is replayed
+    through the callbacks of later identical queries, so an animated search looks the same from the cache.
+    """
+    def __init__(self, max_size=1024, name=None, max_events=1000000):
+        """
+        Initializes the cache.
+
+        Args:
+            max_size (int, optional): Maximum number of results kept. Defaults to 1024.
+            name (str, optional): File where the cache is persisted. Loaded if it exists. Defaults to None.
+            max_events (int, optional): Maximum number of events recorded with a result. Longer searches
+                are searched again when queried with callbacks. Defaults to 1000000.
+        """
+        self.max_size = int(max_size)
+        self.max_events = int(max_events)
+        self.name = name
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if name and os.path.exists(name):
+            with open(name, 'rb') as file:
+                self.results.update(pickle.load(file))
+            self.evict()
+
+    def __len__(self):
+        return len(self.results)
+
+    def solve(self, grid, start, goal, algorithm="a*", cost=1, on_expand=None, on_visit=None, reachability=None):
+        """ Finds a path as algorithms.solve does, reusing the result of an identical previous query. """
+        if not isinstance(grid, Grid):
+            grid = Grid.from_rows(grid)
+        key = (digest(grid), tuple(start), tuple(goal), ALIASES.get(algorithm, algorithm), cost)
+        is_traced = on_expand is not None or on_visit is not None
+        entry = self.results.get(key)
+        if entry is not None and (entry[1] is not None or not is_traced):
+            self.hits += 1
+            self.results.move_to_end(key)
+            result, trace = entry
+            if is_traced:
+                replay(trace, on_expand, on_visit)
+            return result
+        self.misses += 1
+        if not is_traced:
+            result = solve(grid, start, goal, algorithm, cost, reachability=reachability)
+            self.results[key] = (result, None)
+            self.evict()
+            return result
+
+        # Record the search while forwarding its events
+        trace = Trace(grid.rows, grid.columns)
+
+        def expand(node):
+            trace.expand(node)
+            if on_expand is not None:
+                on_expand(node)
+
+        def visit(node):
+            trace.visit(node)
+            if on_visit is not None:
+                on_visit(node)
+
+        result = solve(grid, start, goal, algorithm, cost, expand, visit, reachability)
+        self.results[key] = (result, trace if len(trace) <= self.max_events else None)
+        self.evict()
+        return result
+
+    def evict(self):
+        """ Removes the least recently used results above the maximum size. """
+        while len(self.results) > self.max_size:
+            self.results.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, maze_digest=None):
+        """ Removes the results of a maze, given its digest, or all results. """
+        if maze_digest is None:
+            self.results.clear()
+            return
+        for key in [key for key in self.results if key[0] == maze_digest]:
+            del self.results[key]
+
+    def save(self, name=None):
+        """ Persists the cache to a file. Defaults to the file given at initialization. """
+        with open(name or self.name, 'wb') as file:
+            pickle.dump(list(self.results.items()), file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def stats(self):
+        """ Gets hit, miss and eviction counters. """
+        return {"size": len(self.results), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
@@ -0,0 +1,134 @@
+""" Command line interface: the menu, or solving maze files without a display. """
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .algorithms import ALGORITHMS, ALIASES, STATE_GOAL, STATE_START, solve
+from .grid import Grid
+from .nearest import solve_nearest
+
+
+# Extensions of the maze files found in directories
+EXTENSIONS = (".txt", ".maze")
+
+
+def find_mazes(paths):
+    """ Lists maze files, expanding directories into the maze files they contain. """
+    names = []
+    for path in paths:
+        if os.path.isdir(path):
+            names += sorted(os.path.join(path, name) for name in os.listdir(path) if os.path.splitext(name)[1] in EXTENSIONS)
+        else:
+            names.append(path)
+    return names
+
+
+def solve_file(name, algorithm="a*", cost=1, include_path=True, include_stats=False):
+    """
+    Solves a maze file from its start to its goal, or from its starts to the nearest of its goals if there are several.
+
+    Returns:
+        dict: Search result and time in seconds, or the error that prevented solving.
+    """
+    try:
+        grid = Grid.load(name)
+        starts = grid.find(STATE_START)
+        goals = grid.find(STATE_GOAL)
+        if not starts or not goals:
+            raise ValueError("Maze has no start or no goal")
+        begin = time.perf_counter()
+        if len(starts) > 1 or len(goals) > 1:
+            result = solve_nearest(grid, starts, goals, algorithm, cost)
+        else:
+            result = solve(grid, starts[0], goals[0], algorithm, cost)
+        elapsed = time.perf_counter() - begin
+    except (OSError, ValueError) as error:
+        return {"maze": name, "error": str(error)}
+    record = {
+        "maze": name,
+        "algorithm": result.algorithm,
+        "start": result.start or starts[0],
+        "goal": result.goal or goals[0],
+        "found": result.found,
+        "cost": result.cost,
+        "path_length": len(result.path),
+        "expanded": result.expanded,
+        "max_frontier": result.max_frontier,
+        "time": round(elapsed, 6),
+    }
+    if include_stats:
+        record["stats"] = result.stats.as_dict()
+    if include_path:
+        record["path"] = result.path
+    return record
+
+
+def solve_files(names, algorithm="a*", cost=1, include_path=True, workers=None, include_stats=False):
+    """
+    Solves maze files using a pool of processes.
+
+    Yields:
+        dict: Record of each maze as returned by solve_file, in order of completion.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(names) == 1:
+        for name in names:
+            yield solve_file(name, algorithm, cost, include_path, include_stats)
+        return
+    names = iter(names)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Keep a bounded number of mazes in flight
+        pending = set()
+        while True:
+            while len(pending) < 2 * workers:
+                name = next(names, None)
+                if name is None:
+                    break
+                pending.add(executor.submit(solve_file, name, algorithm, cost, include_path, include_stats))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def show_menu():
+    """ Displays the menu. The graphical interface is only imported here. """
+    import tkinter as tk
+
+    from .menu import MenuWindow
+
+    root = tk.Tk()
+    p = tk.PhotoImage(file="images/icon.png")
+    root.iconphoto(False, p)
+    MenuWindow(root).pack()
+    root.mainloop()
+
+
+def main(args=None):
+    """ Runs the command line. Returns the exit status. """
+    parser = argparse.ArgumentParser(prog="python -m pathfinding_algorithms", description="Displays the menu, or runs a command.")
+    commands = parser.add_subparsers(dest="command")
+    solve_parser = commands.add_parser("solve", help="solve maze files, writing one JSON line per maze")
+    solve_parser.add_argument("paths", nargs="+", help="maze files or directories of maze files")
+    solve_parser.add_argument("--algorithm", default="a*", choices=list(ALGORITHMS) + list(ALIASES), help="algorithm to solve the mazes")
+    solve_parser.add_argument("--cost", type=int, default=1, help="cost of moving from one cell to another adjacent")
+    solve_parser.add_argument("--workers", type=int, help="number of processes, defaults to the number of CPUs")
+    solve_parser.add_argument("--no-path", action="store_true", help="leave out the cells of the paths")
+    solve_parser.add_argument("--stats", action="store_true", help="add the search counters and phase timings")
+    args = parser.parse_args(args)
+
+    if args.command is None:
+        show_menu()
+        return 0
+
+    status = 0
+    for record in solve_files(find_mazes(args.paths), args.algorithm, args.cost, not args.no_path, args.workers, args.stats):
+        if "error" in record:
+            status = 1
+        sys.stdout.write(json.dumps(record) + "\n")
+        sys.stdout.flush()
+    return status
@@ -0,0 +1,96 @@
+""" Whole-maze distance fields computed with NumPy. """
+import numpy as np
+
+from .algorithms import STATE_BLOCKED
+from .grid import Grid
+
+
+def heuristic_grid(rows, columns, goal, cost=1):
+    """ Calculates the Manhattan distance from every cell to the goal, scaled by cost. """
+    row_distances = np.abs(np.arange(rows, dtype=np.int32) - goal[0])
+    col_distances = np.abs(np.arange(columns, dtype=np.int32) - goal[1])
+    return (row_distances[:, None] + col_distances[None, :]) * np.int32(cost)
+
+
+def nearest_heuristic_grid(rows, columns, goals, cost=1):
+    """
+    Calculates the Manhattan distance from every cell to the nearest goal, scaled by cost.
+
+    Vertical distances to the goals of each column are spread along the rows with running minimums.
+    """
+    goals = np.asarray(goals, dtype=np.int32).reshape(-1, 2)
+    vertical = np.full((rows, columns), rows + columns, dtype=np.int32)
+    row_numbers = np.arange(rows, dtype=np.int32)
+    for goal_row, goal_col in goals:
+        vertical[:, goal_col] = np.minimum(vertical[:, goal_col], np.abs(row_numbers - goal_row))
+    col_numbers = np.arange(columns, dtype=np.int32)
+    left = np.minimum.accumulate(vertical - col_numbers, axis=1) + col_numbers
+    right = np.minimum.accumulate((vertical + col_numbers)[:, ::-1], axis=1)[:, ::-1] - col_numbers
+    return np.minimum(left, right) * np.int32(cost)
+
+
+def distance_field(grid, goal):
+    """
+    Calculates the number of steps from every cell to the goal.
+
+    The breadth-first wavefront is expanded one whole layer per array operation.
+
+    Args:
+        grid (Grid or list): Maze grid or rows of cell states.
+        goal (tuple or list): Goal cell (row, col), or several goal cells to measure the distance to the nearest one.
+
+    Returns:
+        numpy.ndarray: Array of int32 with the shape of the maze. Blocked and unreachable cells are -1.
+    """
+    if not isinstance(grid, Grid):
+        grid = Grid.from_rows(grid)
+    rows, columns = grid.rows, grid.columns
+    stride = columns + 2
+
+    # Open cells, surrounded by a border of blocked cells
+    cells = np.frombuffer(grid.cells, np.uint8, rows * columns, grid.offset).reshape(rows, columns)
+    unvisited = np.zeros((rows + 2, stride), dtype=bool)
+    unvisited[1:-1, 1:-1] = cells != ord(STATE_BLOCKED)
+    unvisited = unvisited.ravel()
+    distances = np.full(unvisited.size, -1, dtype=np.int32)
+
+    # Expand wavefront
+    offsets = np.array([-stride, stride, -1, 1])
+    goals = np.asarray(goal, dtype=np.int64).reshape(-1, 2)
+    frontier = np.unique((goals[:, 0] + 1) * stride + goals[:, 1] + 1)
+    frontier = frontier[unvisited[frontier]]
+    distance = 0
+    while frontier.size:
+        distances[frontier] = distance
+        unvisited[frontier] = False
+        neighbors = (frontier[:, None] + offsets).ravel()
+        frontier = np.unique(neighbors[unvisited[neighbors]])
+        distance += 1
+    return distances.reshape(rows + 2, stride)[1:-1, 1:-1].copy()
+
+
+def descend(field, start):
+    """
+    Recovers the path from start to the goal of a distance field, stepping to a closer neighbor each time.
+
+    Args:
+        field (numpy.ndarray): Distance field returned by distance_field.
+        start (tuple): Start cell (row, col).
+
+    Returns:
+        list: Cells (row, col) from start to goal. Empty if the goal is unreachable.
+    """
+    rows, columns = field.shape
+    row, col = start
+    distance = field.item(row, col)
+    if distance < 0:
+        return []
+    path = [(row, col)]
+    while distance > 0:
+        distance -= 1
+        for next_row, next_col in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if 0 <= next_row < rows and 0 <= next_col < columns and field.item(next_row, next_col) == distance:
+                row, col = next_row, next_col
+                break
+        path.append((row, col))
+    return path
@@ -0,0 +1,281 @@
+""" Seeded maze generators writing directly into a compact grid. """
+import argparse
+import random
+import sys
+from array import array
+
+import numpy as np
+
+from .grid import Grid
+
+
+def obstacles(rows, columns, density=0.3, seed=None):
+    """
+    Generates a maze with a fraction density of randomly blocked cells.
+
+    Args:
+        rows (int): Number of rows of the maze.
+        columns (int): Number of columns of the maze.
+        density (float, optional): Fraction of blocked cells. Defaults to 0.3.
+        seed (int, optional): Seed of the random generator. Defaults to None.
+
+    Returns:
+        Grid: Maze with the start at the top left and the goal at the bottom right.
+    """
+    cells = rows * columns
+    noise = random.Random(seed).getrandbits(8 * cells).to_bytes(cells, "little")
+    table = bytes(ord('X') if value < density * 256 else ord('0') for value in range(256))
+    grid = Grid(rows, columns, bytearray(noise.translate(table)))
+    grid[0, 0] = 'S'
+    grid[rows - 1, columns - 1] = 'G'
+    return grid
+
+
+# Perfect mazes
+#
+# Rooms are the cells with even row and column, walls are the cells between them. Every pair of
+# rooms is connected by exactly one path. With an even number of rows or columns, the last one
+# stays blocked.
+
+def carve(rows, columns, first_rows, first_cols, second_rows, second_cols):
+    """
+    Builds a perfect maze from its passages.
+
+    Args:
+        rows (int): Number of rows of the maze.
+        columns (int): Number of columns of the maze.
+        first_rows, first_cols (numpy.ndarray): Room coordinates of one end of each passage.
+        second_rows, second_cols (numpy.ndarray): Room coordinates of the other end of each passage.
+
+    Returns:
+        Grid: Maze with the start at the first room and the goal at the last one.
+    """
+    cells = np.full((rows, columns), ord('X'), dtype=np.uint8)
+    cells[::2, ::2] = ord('0')
+    # The wall between rooms (r1, c1) and (r2, c2) is the cell (r1 + r2, c1 + c2)
+    cells[first_rows + second_rows, first_cols + second_cols] = ord('0')
+    cells[0, 0] = ord('S')
+    cells[(rows - 1) // 2 * 2, (columns - 1) // 2 * 2] = ord('G')
+    return Grid(rows, columns, bytearray(cells.tobytes()))
+
+
+def carve_tree(rows, columns, parents):
+    """ Builds a perfect maze from the parent of each room in a padded array of rooms, as a spanning tree. """
+    room_columns = (columns + 1) // 2
+    rooms = np.frombuffer(parents, dtype=np.int32)
+    children = np.flatnonzero(rooms >= 0)
+    first_rows, first_cols = np.divmod(children, room_columns + 2)
+    second_rows, second_cols = np.divmod(rooms[children], room_columns + 2)
+    return carve(rows, columns, first_rows - 1, first_cols - 1, second_rows - 1, second_cols - 1)
+
+
+def padded_rooms(rows, columns):
+    """ Creates the flags of unvisited rooms, surrounded by a border of visited ones, and an empty parent array. """
+    room_rows, room_columns = (rows + 1) // 2, (columns + 1) // 2
+    stride = room_columns + 2
+    unvisited = bytearray(stride)
+    unvisited += (b'\x00' + b'\x01' * room_columns + b'\x00') * room_rows
+    unvisited += bytes(stride)
+    parents = array('i', [-1]) * len(unvisited)
+    return unvisited, parents, stride
+
+
+def backtracker(rows, columns, seed=None):
+    """
+    Generates a perfect maze with the recursive backtracker, using an explicit stack.
+
+    Passages are long and winding, with few dead ends. Rooms are visited one at a time in Python,
+    so very large mazes are generated faster by kruskal.
+
+    Args:
+        rows (int): Number of rows of the maze.
+        columns (int): Number of columns of the maze.
+        seed (int, optional): Seed of the random generator. Defaults to None.
+
+    Returns:
+        Grid: Generated maze.
+    """
+    unvisited, parents, stride = padded_rooms(rows, columns)
+    rng = random.Random(seed)
+    offsets = (-stride, stride, -1, 1)
+    source = stride + 1
+    unvisited[source] = 0
+    stack = [source]
+    while stack:
+        current = stack[-1]
+        options = [current + offset for offset in offsets if unvisited[current + offset]]
+        if not options:
+            stack.pop()
+            continue
+        nxt = options[int(rng.random() * len(options))] if len(options) > 1 else options[0]
+        unvisited[nxt] = 0
+        parents[nxt] = current
+        stack.append(nxt)
+    return carve_tree(rows, columns, parents)
+
+
+def prim(rows, columns, seed=None):
+    """
+    Generates a perfect maze with the randomized Prim's algorithm.
+
+    A random room of the frontier is connected to a random visited neighbor at each step.
+    Passages branch often, with many short dead ends. Rooms are visited one at a time in Python,
+    so very large mazes are generated faster by kruskal.
+
+    Args:
+        rows (int): Number of rows of the maze.
+        columns (int): Number of columns of the maze.
+        seed (int, optional): Seed of the random generator. Defaults to None.
+
+    Returns:
+        Grid: Generated maze.
+    """
+    # Unvisited rooms are 1, frontier rooms 2, visited rooms 3 and the border 0
+    unvisited, parents, stride = padded_rooms(rows, columns)
+    rng = random.Random(seed)
+    offsets = (-stride, stride, -1, 1)
+    source = stride + 1
+    unvisited[source] = 2
+    frontier = [source]
+    while frontier:
+        # Remove a random room of the frontier by swapping it with the last one
+        position = int(rng.random() * len(frontier))
+        current = frontier[position]
+        frontier[position] = frontier[-1]
+        frontier.pop()
+        unvisited[current] = 3
+        visited = []
+        for offset in offsets:
+            nxt = current + offset
+            state = unvisited[nxt]
+            if state == 1:
+                unvisited[nxt] = 2
+                frontier.append(nxt)
+            elif state == 3:
+                visited.append(nxt)
+        if visited:
+            parents[current] = visited[int(rng.random() * len(visited))]
+    return carve_tree(rows, columns, parents)
+
+
+def kruskal(rows, columns, seed=None):
+    """
+    Generates a perfect maze with the randomized Kruskal's algorithm.
+
+    Walls are opened in random order unless they separate rooms that are already connected. The same
+    tree is built in a few rounds of array operations: every set of connected rooms takes the first of its
+    walls in that order, and the sets are merged with union-find over an array of parents.
+
+    Args:
+        rows (int): Number of rows of the maze.
+        columns (int): Number of columns of the maze.
+        seed (int, optional): Seed of the random generator. Defaults to None.
+
+    Returns:
+        Grid: Generated maze.
+    """
+    room_rows, room_columns = (rows + 1) // 2, (columns + 1) // 2
+    size = room_rows * room_columns
+    rooms = np.arange(size, dtype=np.int32).reshape(room_rows, room_columns)
+
+    # Walls between horizontally and vertically adjacent rooms, with their random position in the order.
+    # They are kept in maze order, so that looking up their sets reads memory sequentially
+    first = np.concatenate((rooms[:, :-1].ravel(), rooms[:-1, :].ravel()))
+    second = np.concatenate((rooms[:, 1:].ravel(), rooms[1:, :].ravel()))
+    ranks = np.random.default_rng(seed).permutation(len(first)).astype(np.int32)
+
+    # Merge sets through their first wall until every wall left is inside a set. Sets are renumbered
+    # after every round, so the arrays shrink with the number of sets
+    walls = np.arange(len(first), dtype=np.int32)
+    first_sets, second_sets = first, second
+    count = size
+    opened = []
+    while True:
+        between = np.flatnonzero(first_sets != second_sets)
+        if not len(between):
+            break
+        walls, ranks = walls[between], ranks[between]
+        first_sets, second_sets = first_sets[between], second_sets[between]
+        earliest = np.full(count, np.iinfo(np.int32).max, dtype=np.int32)
+        np.minimum.at(earliest, first_sets, ranks)
+        np.minimum.at(earliest, second_sets, ranks)
+        first_chose = ranks == earliest[first_sets]
+        second_chose = ranks == earliest[second_sets]
+        opened.append(walls[first_chose | second_chose])
+
+        # Link every set to the other side of its wall, except one of two sets sharing the same wall
+        parents = np.arange(count, dtype=np.int32)
+        parents[first_sets[first_chose]] = second_sets[first_chose]
+        parents[second_sets[second_chose]] = first_sets[second_chose]
+        mutual = first_chose & second_chose
+        roots = np.minimum(first_sets[mutual], second_sets[mutual])
+        parents[roots] = roots
+        while True:
+            grandparents = parents[parents]
+            if np.array_equal(grandparents, parents):
+                break
+            parents = grandparents
+
+        # Number the merged sets consecutively
+        is_root = parents == np.arange(count, dtype=np.int32)
+        numbers = (np.cumsum(is_root, dtype=np.int32) - 1)[parents]
+        count = int(is_root.sum())
+        first_sets, second_sets = numbers[first_sets], numbers[second_sets]
+
+    opened = np.concatenate(opened + [np.empty(0, dtype=np.int32)])
+    first, second = first[opened], second[opened]
+    first_rows, first_cols = np.divmod(first, room_columns)
+    second_rows, second_cols = np.divmod(second, room_columns)
+    return carve(rows, columns, first_rows, first_cols, second_rows, second_cols)
+
+
+GENERATORS = {
+    "backtracker": backtracker,
+    "kruskal": kruskal,
+    "prim": prim,
+    "obstacles": obstacles,
+}
+
+
+def generate(rows, columns, method="backtracker", seed=None, density=0.3, name=None):
+    """
+    Generates a maze and optionally saves it.
+
+    Args:
+        rows (int): Number of rows of the maze.
+        columns (int): Number of columns of the maze.
+        method (str, optional): One of GENERATORS. Defaults to "backtracker".
+        seed (int, optional): Seed of the random generator. Defaults to None.
+        density (float, optional): Fraction of blocked cells of the obstacles method. Defaults to 0.3.
+        name (str, optional): Text file or, if the extension is .maze, binary file to save. Defaults to None.
+
+    Returns:
+        Grid: Generated maze.
+    """
+    if method not in GENERATORS:
+        raise ValueError("Unknown generator {}".format(method))
+    if method == "obstacles":
+        grid = obstacles(rows, columns, density, seed)
+    else:
+        grid = GENERATORS[method](rows, columns, seed)
+    if name:
+        grid.save(name)
+    return grid
+
+
+def main(args=None):
+    """ Generates a maze from the command line. """
+    parser = argparse.ArgumentParser(prog="python -m pathfinding_algorithms.generators", description=__doc__)
+    parser.add_argument("rows", type=int, help="rows of the maze")
+    parser.add_argument("columns", type=int, help="columns of the maze")
+    parser.add_argument("output", help="text file or .maze binary file")
+    parser.add_argument("--method", choices=list(GENERATORS), default="backtracker", help="generation algorithm")
+    parser.add_argument("--seed", type=int, help="seed of the random generator")
+    parser.add_argument("--density", type=float, default=0.3, help="fraction of blocked cells of the obstacles method")
+    args = parser.parse_args(args)
+    generate(args.rows, args.columns, args.method, args.seed, args.density, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
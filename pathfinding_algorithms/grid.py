@@ -0,0 +1,162 @@
+""" Compact maze grid and file formats. """
+import mmap
+import os
+import struct
+import tempfile
+
+
+# Binary maze format: magic, version, reserved, rows and columns followed by one byte per cell
+MAGIC = b"MAZE"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+
+# State of an empty cell
+STATE_EMPTY = '0'
+
+
+class Grid:
+    """ Maze grid storing the state of each cell as one byte. """
+    def __init__(self, rows, columns, cells=None, offset=0):
+        """
+        Initializes the grid.
+
+        Args:
+            rows (int): Number of rows of the maze.
+            columns (int): Number of columns of the maze.
+            cells (bytearray or mmap, optional): Buffer holding the states in row-major order. Defaults to empty cells.
+            offset (int, optional): Position of the first cell in the buffer. Defaults to 0.
+        """
+        self.rows = int(rows)
+        self.columns = int(columns)
+        if cells is None:
+            cells = bytearray(STATE_EMPTY.encode()) * (self.rows * self.columns)
+        if len(cells) - offset != self.rows * self.columns:
+            raise ValueError("Buffer size does not match a {}x{} grid".format(self.rows, self.columns))
+        self.cells = cells
+        self.offset = offset
+
+        # Hash of the cells, computed by cache.digest and reset by every write
+        self.content_digest = None
+
+    @classmethod
+    def from_rows(cls, rows):
+        """ Creates grid from a list of rows of states, as in the text format. """
+        cells = bytearray()
+        for row in rows:
+            cells += ''.join(map(str, row)).encode()
+        return cls(len(rows), len(rows[0]) if rows else 0, cells)
+
+    @classmethod
+    def load(cls, name):
+        """ Loads grid from a text file or, if the extension is .maze, maps a binary file into memory. """
+        if os.path.splitext(name)[1] == ".maze":
+            return cls.load_binary(name)
+        return cls.load_text(name)
+
+    @classmethod
+    def load_text(cls, name):
+        """ Loads grid from a comma-separated text file. """
+        cells = bytearray()
+        rows = 0
+        columns = None
+        with open(name, 'rb') as file:
+            for line in file:
+                row = line.strip().replace(b',', b'')
+                if not row:
+                    continue
+                if columns is None:
+                    columns = len(row)
+                elif len(row) != columns:
+                    raise ValueError("Row {} of {} has {} cells instead of {}".format(rows, name, len(row), columns))
+                cells += row
+                rows += 1
+        return cls(rows, columns or 0, cells)
+
+    @classmethod
+    def load_binary(cls, name, writable=False):
+        """
+        Maps a binary maze file into memory without reading it.
+
+        Args:
+            name (str): Path of the .maze file.
+            writable (bool, optional): Write changes back to the file. Otherwise they stay private. Defaults to False.
+        """
+        with open(name, 'r+b' if writable else 'rb') as file:
+            cells = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_COPY)
+        if len(cells) < HEADER.size:
+            raise ValueError("{} is too short to be a maze file".format(name))
+        magic, version, _, rows, columns = HEADER.unpack_from(cells)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("{} is not a version {} maze file".format(name, VERSION))
+        return cls(rows, columns, cells, HEADER.size)
+
+    def save(self, name):
+        """ Saves grid as a text file or, if the extension is .maze, as a binary file. """
+        if os.path.splitext(name)[1] == ".maze":
+            self.save_binary(name)
+        else:
+            self.save_text(name)
+
+    def save_text(self, name):
+        """ Saves grid as a comma-separated text file. """
+        with open(name, 'w') as file:
+            for row in range(self.rows):
+                file.write(','.join(self.row(row).decode()) + "\n")
+
+    def save_binary(self, name):
+        """
+        Saves grid as a binary file.
+
+        The file is written next to the target and then moved over it, so a grid mapped from the
+        target keeps reading the old file instead of a truncated one.
+        """
+        descriptor, temporary = tempfile.mkstemp(suffix=".maze", dir=os.path.dirname(os.path.abspath(name)))
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(HEADER.pack(MAGIC, VERSION, 0, self.rows, self.columns))
+                file.write(self.cells[self.offset:])
+            os.chmod(temporary, os.stat(name).st_mode & 0o777 if os.path.exists(name) else 0o644)
+            os.replace(temporary, name)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+    def index(self, node):
+        """ Gets position of a node (row, col) in the buffer. """
+        return self.offset + node[0] * self.columns + node[1]
+
+    def __getitem__(self, node):
+        return chr(self.cells[self.index(node)])
+
+    def __setitem__(self, node, state):
+        self.cells[self.index(node)] = ord(str(state))
+        self.content_digest = None
+
+    def row(self, row):
+        """ Gets the states of a row as bytes. """
+        start = self.offset + row * self.columns
+        return bytes(self.cells[start:start + self.columns])
+
+    def tobytes(self):
+        """ Gets the states of all cells as bytes. """
+        return bytes(self.cells[self.offset:])
+
+    def find(self, state, count=None):
+        """ Finds up to count nodes (row, col) where state occurs. """
+        code = str(state).encode()
+        nodes = []
+        position = self.cells.find(code, self.offset)
+        while position != -1 and (count is None or len(nodes) < count):
+            nodes.append(divmod(position - self.offset, self.columns))
+            position = self.cells.find(code, position + 1)
+        return nodes
+
+    def copy(self):
+        """ Copies grid into memory. """
+        grid = Grid(self.rows, self.columns, bytearray(self.cells[self.offset:]))
+        grid.content_digest = self.content_digest
+        return grid
+
+    def to_rows(self):
+        """ Converts grid to a list of rows of states. """
+        return [list(self.row(row).decode()) for row in range(self.rows)]
@@ -0,0 +1,276 @@
+""" Hierarchical pathfinding (HPA*) on a precomputed graph of clusters. """
+import heapq
+import pickle
+
+from .algorithms import INFINITY, Layout, SearchResult
+from .cache import digest
+from .grid import Grid
+
+
+# Entrances at least this long get a transition at each end instead of one in the middle
+LONG_ENTRANCE = 6
+
+
+class HierarchicalMap:
+    """
+    Abstraction of a maze into square clusters connected through entrances.
+
+    Queries search the small graph of entrance nodes and then refine each abstract edge inside its cluster.
+    Paths are near-optimal: they can be slightly longer than the ones found by A*.
+    """
+    def __init__(self, grid, cluster_size=16, build=True):
+        """
+        Initializes the abstraction.
+
+        Args:
+            grid (Grid or list): Maze grid or rows of cell states.
+            cluster_size (int, optional): Number of rows and columns of each cluster. Defaults to 16.
+            build (bool, optional): Compute the entrances and intra-cluster costs. Defaults to True.
+        """
+        if not isinstance(grid, Grid):
+            grid = Grid.from_rows(grid)
+        self.layout = Layout(grid)
+        self.digest = digest(grid)
+        self.cluster_size = int(cluster_size)
+
+        # Abstract graph: edges between entrance nodes and entrance nodes of each cluster
+        self.edges = {}
+        self.clusters = {}
+        if build:
+            self.build()
+
+    def cluster_of(self, index):
+        """ Gets the cluster (row, col) of a flat index. """
+        row, col = self.layout.node(index)
+        return (row // self.cluster_size, col // self.cluster_size)
+
+    def add_edge(self, source, target, cost):
+        """ Adds an edge to the abstract graph, keeping the cheapest one. """
+        neighbors = self.edges.setdefault(source, {})
+        if cost < neighbors.get(target, INFINITY):
+            neighbors[target] = cost
+        self.edges.setdefault(target, {})
+        self.clusters.setdefault(self.cluster_of(source), set()).add(source)
+        self.clusters.setdefault(self.cluster_of(target), set()).add(target)
+
+    def build(self):
+        """ Finds the entrances between adjacent clusters and the costs between entrances of each cluster. """
+        layout = self.layout
+        weights = layout.weights
+        size = self.cluster_size
+
+        # Entrances along every border between clusters, as pairs of adjacent cells
+        borders = []
+        for col in range(size, layout.columns, size):
+            borders.append([(layout.index((row, col - 1)), layout.index((row, col))) for row in range(layout.rows)])
+        for row in range(size, layout.rows, size):
+            borders.append([(layout.index((row - 1, col)), layout.index((row, col))) for col in range(layout.columns)])
+        for border in borders:
+            for position in range(0, len(border), size):
+                segment = border[position:position + size]
+                run = []
+                for pair in segment + [None]:
+                    if pair is not None and weights[pair[0]] and weights[pair[1]]:
+                        run.append(pair)
+                        continue
+                    if run:
+                        transitions = [run[0], run[-1]] if len(run) >= LONG_ENTRANCE else [run[len(run) // 2]]
+                        for first, second in transitions:
+                            self.add_edge(first, second, weights[second])
+                            self.add_edge(second, first, weights[first])
+                        run = []
+
+        # Costs between entrance nodes inside each cluster
+        for nodes in self.clusters.values():
+            for node in nodes:
+                distances, _, _ = self.search_cluster(node, nodes)
+                for other in nodes:
+                    if other != node and other in distances:
+                        self.add_edge(node, other, distances[other])
+
+    def search_cluster(self, source, targets=None):
+        """
+        Runs the Dijkstra algorithm without leaving the cluster of the source.
+
+        The cluster is copied into a small padded array, so neighbors need no bounds checks.
+
+        Args:
+            source (int): Flat index of the source.
+            targets (set, optional): Stop once these indices are reached. Defaults to the whole cluster.
+
+        Returns:
+            tuple: Distances to the reached targets (or cells), function returning the path to one of them,
+                and number of expanded nodes.
+        """
+        layout = self.layout
+        cluster_row, cluster_col = self.cluster_of(source)
+        first_row, first_col = cluster_row * self.cluster_size, cluster_col * self.cluster_size
+        rows = min(self.cluster_size, layout.rows - first_row)
+        columns = min(self.cluster_size, layout.columns - first_col)
+
+        # Copy cluster
+        stride = columns + 2
+        weights = bytearray(stride)
+        for row in range(first_row, first_row + rows):
+            start = layout.index((row, first_col))
+            weights += b'\x00' + layout.weights[start:start + columns] + b'\x00'
+        weights += bytes(stride)
+        offset = layout.index((first_row, first_col)) - layout.stride - 1
+
+        def local(index):
+            row, col = divmod(index - offset, layout.stride)
+            return row * stride + col
+
+        def outer(index):
+            row, col = divmod(index, stride)
+            return offset + row * layout.stride + col
+
+        # Search cluster
+        remaining = set(local(target) for target in targets) if targets is not None else None
+        offsets = (-stride, stride, -1, 1)
+        distances = [INFINITY] * len(weights)
+        parents = [-1] * len(weights)
+        closed = bytearray(len(weights))
+        local_source = local(source)
+        distances[local_source] = 0
+        frontier = [(0, local_source)]
+        expanded = 0
+        while frontier:
+            distance, current = heapq.heappop(frontier)
+            if closed[current]:
+                continue
+            closed[current] = 1
+            expanded += 1
+            if remaining is not None:
+                remaining.discard(current)
+                if not remaining:
+                    break
+            for direction in offsets:
+                nxt = current + direction
+                weight = weights[nxt]
+                if weight and distance + weight < distances[nxt]:
+                    distances[nxt] = distance + weight
+                    parents[nxt] = current
+                    heapq.heappush(frontier, (distance + weight, nxt))
+
+        def walk(target):
+            path = []
+            current = local(target)
+            while current != -1:
+                path.append(outer(current))
+                current = parents[current]
+            path.reverse()
+            return path
+
+        # Map reached cells back to flat indices of the maze
+        if targets is None:
+            reached = {outer(index): distances[index] for index in range(len(weights)) if distances[index] != INFINITY}
+        else:
+            reached = {target: distances[local(target)] for target in targets if distances[local(target)] != INFINITY}
+        return reached, walk, expanded
+
+    def solve(self, start, goal, cost=1):
+        """
+        Finds a path between two cells.
+
+        Args:
+            start (tuple): Start cell (row, col).
+            goal (tuple): Goal cell (row, col).
+            cost (int, optional): Cost of moving from one cell to another adjacent. Defaults to 1.
+
+        Returns:
+            SearchResult: Path found, with the abstract and refinement expansions added up.
+        """
+        layout = self.layout
+        weights = layout.weights
+        source = layout.index(start)
+        target = layout.index(goal)
+        if not weights[source] or not weights[target]:
+            return SearchResult("hpa*", [], None, 0, 0)
+
+        # Connect start and goal to the entrances of their clusters
+        start_nodes = set(self.clusters.get(self.cluster_of(source), ()))
+        goal_nodes = set(self.clusters.get(self.cluster_of(target), ()))
+        if self.cluster_of(source) == self.cluster_of(target):
+            start_nodes.add(target)
+        start_distances, start_walk, expanded = self.search_cluster(source, start_nodes)
+        goal_distances, _, goal_expanded = self.search_cluster(target, goal_nodes)
+        expanded += goal_expanded
+        start_edges = {node: distance for node, distance in start_distances.items() if node != target}
+        goal_edges = {node: distance + weights[target] - weights[node] for node, distance in goal_distances.items()}
+
+        # Search abstract graph
+        goal_row, goal_col = divmod(target, layout.stride)
+        distances = {source: 0}
+        parents = {source: -1}
+        closed = set()
+        frontier = [(0, 0, source)]
+        max_frontier = 1
+        while frontier:
+            max_frontier = max(max_frontier, len(frontier))
+            _, _, current = heapq.heappop(frontier)
+            if current in closed:
+                continue
+            if current == target:
+                break
+            closed.add(current)
+            expanded += 1
+            neighbors = list(self.edges.get(current, {}).items())
+            if current == source:
+                neighbors += list(start_edges.items())
+            if current in goal_edges:
+                neighbors.append((target, goal_edges[current]))
+            for nxt, edge_cost in neighbors:
+                new_distance = distances[current] + edge_cost
+                if nxt not in closed and new_distance < distances.get(nxt, INFINITY):
+                    distances[nxt] = new_distance
+                    parents[nxt] = current
+                    row, col = divmod(nxt, layout.stride)
+                    heuristic = abs(goal_row - row) + abs(goal_col - col)
+                    heapq.heappush(frontier, (new_distance + heuristic, heuristic, nxt))
+
+        # Prefer a path inside the shared cluster when it is not longer
+        if target in start_distances and start_distances[target] <= distances.get(target, INFINITY):
+            return self.result(start_walk(target), cost, expanded, max_frontier)
+        if target not in distances:
+            return SearchResult("hpa*", [], None, expanded, max_frontier)
+
+        # Refine abstract path
+        abstract_path = []
+        current = target
+        while current != -1:
+            abstract_path.append(current)
+            current = parents[current]
+        abstract_path.reverse()
+        path = [source]
+        for current, nxt in zip(abstract_path, abstract_path[1:]):
+            if nxt - current in layout.neighbors():
+                path.append(nxt)
+                continue
+            _, segment_walk, segment_expanded = self.search_cluster(current, {nxt})
+            expanded += segment_expanded
+            path += segment_walk(nxt)[1:]
+        return self.result(path, cost, expanded, max_frontier)
+
+    def result(self, path, cost, expanded, max_frontier):
+        """ Converts a path of flat indices into a search result. """
+        total_cost = sum(self.layout.weights[index] for index in path[1:]) * cost
+        return SearchResult("hpa*", [self.layout.node(index) for index in path], total_cost, expanded, max_frontier)
+
+    def save(self, name):
+        """ Saves the abstract graph, e.g. next to the maze as maze.txt.hpa. """
+        with open(name, 'wb') as file:
+            pickle.dump({"digest": self.digest, "cluster_size": self.cluster_size, "edges": self.edges, "clusters": self.clusters},
+                        file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, name, grid):
+        """ Loads the abstract graph of a maze saved with save. Raises ValueError if the maze changed since. """
+        with open(name, 'rb') as file:
+            data = pickle.load(file)
+        hierarchical_map = cls(grid, data["cluster_size"], build=False)
+        if hierarchical_map.digest != data["digest"]:
+            raise ValueError("{} was built for a different maze".format(name))
+        hierarchical_map.edges = data["edges"]
+        hierarchical_map.clusters = data["clusters"]
+        return hierarchical_map
@@ -0,0 +1,160 @@
+""" Incremental replanning with D* Lite. """
+import heapq
+from array import array
+
+from .algorithms import INFINITY, Layout, SearchResult
+
+
+class IncrementalPlanner:
+    """
+    D* Lite planner that keeps its search state between changes of the maze.
+
+    The search runs backwards from the goal, so the start can move and cells can be blocked
+    or opened while only the part of the solution affected by the changes is repaired.
+    """
+    def __init__(self, grid, start, goal, cost=1):
+        """
+        Initializes the planner.
+
+        Args:
+            grid (Grid, list or Layout): Maze grid or rows of cell states.
+            start (tuple): Start cell (row, col).
+            goal (tuple): Goal cell (row, col).
+            cost (int, optional): Cost of moving from one cell to another adjacent. Defaults to 1.
+        """
+        self.layout = Layout(grid) if not isinstance(grid, Layout) else grid
+        self.cost = int(cost)
+        self.start = tuple(start)
+        self.goal = tuple(goal)
+        self.source = self.layout.index(self.start)
+        self.target = self.layout.index(self.goal)
+        self.offsets = self.layout.neighbors()
+        self.expanded = 0
+        self.max_frontier = 0
+
+        # Initialize search state
+        size = len(self.layout.weights)
+        self.distances = array('i', [INFINITY]) * size
+        self.lookaheads = array('i', [INFINITY]) * size
+        self.lookaheads[self.target] = 0
+        self.key_modifier = 0
+        self.queued = {}
+        self.frontier = []
+        self.push(self.target)
+
+    def heuristic(self, index):
+        """ Gets the Manhattan distance between a node and the start. """
+        row, col = divmod(index, self.layout.stride)
+        start_row, start_col = divmod(self.source, self.layout.stride)
+        return (abs(row - start_row) + abs(col - start_col)) * self.cost
+
+    def calculate_key(self, index):
+        """ Calculates the priority of a node. """
+        distance = min(self.distances[index], self.lookaheads[index])
+        return (distance + self.heuristic(index) + self.key_modifier, distance)
+
+    def push(self, index):
+        """ Adds a node to the frontier, replacing any previous entry. """
+        key = self.calculate_key(index)
+        self.queued[index] = key
+        heapq.heappush(self.frontier, (key, index))
+        if len(self.frontier) > self.max_frontier:
+            self.max_frontier = len(self.frontier)
+
+    def top_key(self):
+        """ Gets the smallest key of the frontier, discarding outdated entries. """
+        while self.frontier and self.queued.get(self.frontier[0][1]) != self.frontier[0][0]:
+            heapq.heappop(self.frontier)
+        return self.frontier[0][0] if self.frontier else (INFINITY, INFINITY)
+
+    def update_node(self, index):
+        """ Recalculates the lookahead of a node and queues it if it became inconsistent. """
+        weights = self.layout.weights
+        if index == self.target:
+            self.lookaheads[index] = 0 if weights[index] else INFINITY
+        else:
+            lookahead = INFINITY
+            if weights[index]:
+                for offset in self.offsets:
+                    nxt = index + offset
+                    if weights[nxt] and self.distances[nxt] != INFINITY:
+                        lookahead = min(lookahead, self.distances[nxt] + weights[nxt] * self.cost)
+            self.lookaheads[index] = lookahead
+        if self.distances[index] != self.lookaheads[index]:
+            self.push(index)
+        else:
+            self.queued.pop(index, None)
+
+    def compute(self, on_expand=None):
+        """ Expands nodes until the start is consistent and no queued node can improve it. """
+        distances = self.distances
+        lookaheads = self.lookaheads
+        source = self.source
+        while self.top_key() < self.calculate_key(source) or lookaheads[source] != distances[source]:
+            if not self.frontier:
+                break
+            key, current = heapq.heappop(self.frontier)
+            del self.queued[current]
+            new_key = self.calculate_key(current)
+            if key < new_key:
+                self.push(current)
+                continue
+            self.expanded += 1
+            if on_expand is not None:
+                on_expand(self.layout.node(current))
+            if distances[current] > lookaheads[current]:
+                distances[current] = lookaheads[current]
+            else:
+                distances[current] = INFINITY
+                self.update_node(current)
+            for offset in self.offsets:
+                self.update_node(current + offset)
+
+    def plan(self, on_expand=None):
+        """
+        Repairs the solution after the latest changes and extracts the path.
+
+        Args:
+            on_expand (callable, optional): Called with each expanded cell. Defaults to None.
+
+        Returns:
+            SearchResult: Path from the current start to the goal and statistics of this replanning.
+        """
+        self.expanded = 0
+        self.max_frontier = len(self.frontier)
+        self.compute(on_expand)
+        path = []
+        total_cost = None
+        if self.distances[self.source] != INFINITY:
+            total_cost = self.distances[self.source]
+            weights = self.layout.weights
+            current = self.source
+            path.append(current)
+            while current != self.target:
+                current = min((current + offset for offset in self.offsets if weights[current + offset]),
+                              key=lambda index: self.distances[index] + weights[index] * self.cost)
+                path.append(current)
+        return SearchResult("d* lite", [self.layout.node(index) for index in path], total_cost, self.expanded, self.max_frontier)
+
+    def move(self, start):
+        """ Moves the start to another cell, e.g. after the agent took some steps. """
+        self.key_modifier += self.heuristic(self.layout.index(start))
+        self.start = tuple(start)
+        self.source = self.layout.index(self.start)
+
+    def update(self, changes):
+        """
+        Applies changes to the maze.
+
+        Args:
+            changes (iterable): Pairs of cell (row, col) and its new state.
+        """
+        for node, state in changes:
+            index = self.layout.index(node)
+            weight = self.layout.weights[index]
+            self.layout.set_state(node, state)
+            if self.layout.weights[index] == weight:
+                continue
+            self.update_node(index)
+            for offset in self.offsets:
+                self.update_node(index + offset)
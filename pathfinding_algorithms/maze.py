@@ -1,9 +1,85 @@
+import queue
+import threading
+
+import numpy as np
 import pygame
 
+from .algorithms import WEIGHT_TABLE
+from .cache import PathCache, digest
+from .grid import Grid
+from .incremental import IncrementalPlanner
+from .nearest import solve_nearest, supports_nearest
+from .reachability import ReachabilityIndex
+from .trace import EXPAND, KEYFRAME, PATH, VISIT, Trace
+from .viewport import Viewport
+
+
+# Number of events between two snapshots of a replayed maze
+SNAPSHOT = 16 * KEYFRAME
+
+# Number of events the solver publishes ahead of the window before waiting for it
+EVENT_BUFFER = 1 << 18
+
+# Seconds the solver waits for room in the event buffer before checking if the search was cancelled
+PUBLISH_TIMEOUT = 0.1
+
+
+class SearchCancelled(Exception):
+    """ Raised inside the solver thread to stop a search. """
+
+
+class Snapshots:
+    """ States of a maze every SNAPSHOT events of a replay, each stored as the cells changed since the previous one. """
+    def __init__(self, grid):
+        """
+        Initializes the snapshots.
+
+        Args:
+            grid (Grid): Maze before any event.
+        """
+        self.changes = []
+        self.latest = self.cells(grid).copy()
+
+    @staticmethod
+    def cells(grid):
+        """ Gets the states of a grid as a flat array of bytes, sharing memory with the grid. """
+        return np.frombuffer(grid.cells, np.uint8, grid.rows * grid.columns, grid.offset)
+
+    def update(self, grid, position):
+        """ Takes a snapshot of a grid if a number of events falls on one not taken yet. """
+        if position % SNAPSHOT:
+            return
+        number = position // SNAPSHOT
+        cells = self.cells(grid)
+        if number > len(self.changes):
+            changed = np.flatnonzero(cells != self.latest)
+            self.changes.append((changed, cells[changed]))
+        if number == len(self.changes):
+            self.latest = cells.copy()
+
+    def restore(self, grid, position):
+        """
+        Restores the nearest snapshot taken at or before a number of events.
+
+        Args:
+            grid (Grid): Maze before any event, changed in place.
+            position (int): Number of events to restore.
+
+        Returns:
+            int: Number of events of the snapshot restored.
+        """
+        number = min(position // SNAPSHOT, len(self.changes))
+        cells = self.cells(grid)
+        for changed, states in self.changes[:number]:
+            cells[changed] = states
+        grid.content_digest = None
+        self.update(grid, number * SNAPSHOT)
+        return number * SNAPSHOT
+
 
 class MazeWindow:
     """ Visualization of maze pathfinder. """
-    def __init__(self, rows=12, columns=12, width=20, margin=2, cost=1, title="Maze"):
+    def __init__(self, rows=12, columns=12, width=20, margin=2, cost=1, title="Maze", fps=30, speed=1):
         """
         Initializes maze visualization.
 
@@ -12,8 +88,10 @@ class MazeWindow:
             columns (int, optional): Number of columns of the maze. Defaults to 12.
             width (int, optional): Width size of each cell. Defaults to 20.
             margin (int, optional): Margin size of each cell. Defaults to 2.
-            cost (int, optional): Cost of moving from one cell to another adjacent. Defaults to 1.
+            cost (int, optional): Cost of moving into a cell of weight 1. Defaults to 1.
             title (str, optional): Title of the Pygame window. Defaults to "Maze".
+            fps (int, optional): Frames per second of the visualization. Defaults to 30.
+            speed (int, optional): Node expansions shown per frame. Defaults to 1.
         """
         # Set window dimensions
         self.rows = int(rows)
@@ -23,6 +101,8 @@ class MazeWindow:
         self.margin = int(margin)
         self.cost = int(cost)
         self.title = title
+        self.fps = int(fps)
+        self.speed = int(speed)
         self.size = ((self.height + self.margin) * self.columns, (self.width + self.margin) * self.rows + self.margin)
 
         # Initialize states
@@ -41,329 +121,631 @@ class MazeWindow:
         self.color_blocked = (0, 0, 0)
         self.color_path = (255, 255, 255)
         self.color_default = (112, 128, 144)
+        self.colors = {self.state_start: self.color_start, self.state_visited: self.color_visited,
+                       self.state_explored: self.color_explored, self.state_goal: self.color_goal,
+                       self.state_blocked: self.color_blocked, self.state_path: self.color_path}
+
+        # Heavier cells are drawn darker
+        for weight in range(2, 10):
+            self.colors[str(weight)] = tuple(int(value * (1 - 0.08 * (weight - 1))) for value in self.color_default)
+
+        # States shown by a pixel standing for several cells, from the least to the most important
+        shown = [str(weight) for weight in range(2, 10)] + [self.state_blocked, self.state_visited, self.state_explored,
+                                                            self.state_path, self.state_start, self.state_goal]
+        self.ranks = np.zeros(256, dtype=np.uint8)
+        self.rank_colors = np.zeros((len(shown) + 1, 3), dtype=np.uint8)
+        self.rank_colors[0] = self.color_default
+        for rank, state in enumerate(shown, 1):
+            self.ranks[ord(state)] = rank
+            self.rank_colors[rank] = self.colors[state]
+
+        # Initialize cells to redraw, or the whole view if too many changed to list them
+        self.dirty_nodes = set()
+        self.is_dirty = False
 
         # Initialize grid
-        self.grid = [['0' for col in range(self.columns)] for row in range(self.rows)]
+        self.grid = Grid(self.rows, self.columns)
+
+        # Initialize cache of search results
+        self.cache = PathCache()
+
+        # Initialize incremental planner, kept between runs
+        self.planner = None
+        self.edited_nodes = []
+
+        # Initialize reachability index, built on the first run and updated by edits
+        self.reachability = None
 
         # Load icon
         self.icon = pygame.image.load("images/icon.png")
         pygame.display.set_icon(self.icon)
 
-    def draw_grid(self):
-        """ Draws maze grid. """
-        for row in range(self.rows):
-            for col in range(self.columns):
-                if self.grid[row][col] == self.state_start:
-                    pygame.draw.rect(self.screen, self.color_start, ((self.width + self.margin) * col + self.margin, (self.height + self.margin) * row + self.margin, self.width, self.height))
-                elif self.grid[row][col] == self.state_visited:
-                    pygame.draw.rect(self.screen, self.color_visited, ((self.width + self.margin) * col + self.margin, (self.height + self.margin) * row + self.margin, self.width, self.height))
-                elif self.grid[row][col] == self.state_explored:
-                    pygame.draw.rect(self.screen, self.color_explored, ((self.width + self.margin) * col + self.margin, (self.height + self.margin) * row + self.margin, self.width, self.height))
-                elif self.grid[row][col] == self.state_goal:
-                    pygame.draw.rect(self.screen, self.color_goal, ((self.width + self.margin) * col + self.margin, (self.height + self.margin) * row + self.margin, self.width, self.height))
-                elif self.grid[row][col] == self.state_blocked:
-                    pygame.draw.rect(self.screen, self.color_blocked, ((self.width + self.margin) * col + self.margin, (self.height + self.margin) * row + self.margin, self.width, self.height))
-                elif self.grid[row][col] == self.state_path:
-                    pygame.draw.rect(self.screen, self.color_path, ((self.width + self.margin) * col + self.margin, (self.height + self.margin) * row + self.margin, self.width, self.height))
-                else:
-                    pygame.draw.rect(self.screen, self.color_default, ((self.width + self.margin) * col + self.margin, (self.height + self.margin) * row + self.margin, self.width, self.height))
+    def open_window(self):
+        """ Opens the window, no larger than the screen, showing as much of the maze as fits. """
+        pygame.init()
+        info = pygame.display.Info()
+        if info.current_w > 0 and info.current_h > 0:
+            window_size = (min(self.size[0], info.current_w * 9 // 10), min(self.size[1], info.current_h * 9 // 10))
+        else:
+            window_size = self.size
+        self.screen = pygame.display.set_mode(window_size)
+        pygame.display.set_caption(self.title)
+        self.viewport = Viewport(self.rows, self.columns, self.width, self.margin, window_size)
+        self.dragging = False
+        self.create_tiles()
+        self.draw_grid(full=True)
+
+    def create_tiles(self):
+        """ Pre-renders one tile per state at the size of the cells in view. Must be called once the display is set. """
+        self.tiles = {}
+        size = self.viewport.cell_size
+        for state, color in list(self.colors.items()) + [(None, self.color_default)]:
+            tile = pygame.Surface((size, size)).convert()
+            tile.fill(color)
+            self.tiles[state] = tile
+
+    def cell_rect(self, node):
+        """ Gets the rectangle of a cell in the window, or of the pixel showing it if zoomed out. """
+        return pygame.Rect(self.viewport.cell_rect(node))
+
+    def cell_array(self):
+        """ Gets the states of the maze as an array of bytes, sharing memory with the grid. """
+        return np.frombuffer(self.grid.cells, np.uint8, self.rows * self.columns, self.grid.offset).reshape(self.rows, self.columns)
+
+    def view_event(self, event):
+        """
+        Scrolls or zooms the view: mouse wheel or Page Up/Down to zoom, right button drag or Shift+arrows to scroll.
+
+        Returns:
+            bool: Whether the event was used by the view.
+        """
+        viewport = self.viewport
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button in (4, 5):
+            # Wheel turns are reported as buttons 4 (up) and 5 (down)
+            is_changed = viewport.zoom(1 if event.button == 4 else -1, event.pos)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
+            self.dragging = True
+            return True
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 3:
+            self.dragging = False
+            return True
+        elif event.type == pygame.MOUSEMOTION and self.dragging:
+            top, left = viewport.top, viewport.left
+            viewport.scroll_pixels(*event.rel)
+            is_changed = (top, left) != (viewport.top, viewport.left)
+        elif event.type == pygame.KEYDOWN and event.key in (pygame.K_PAGEUP, pygame.K_PAGEDOWN):
+            is_changed = viewport.zoom(1 if event.key == pygame.K_PAGEUP else -1)
+        elif event.type == pygame.KEYDOWN and event.key in (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT) and pygame.key.get_mods() & pygame.KMOD_SHIFT:
+            rows = viewport.cells(viewport.size[1]) // 4
+            columns = viewport.cells(viewport.size[0]) // 4
+            top, left = viewport.top, viewport.left
+            viewport.scroll({pygame.K_UP: -rows, pygame.K_DOWN: rows}.get(event.key, 0),
+                            {pygame.K_LEFT: -columns, pygame.K_RIGHT: columns}.get(event.key, 0))
+            is_changed = (top, left) != (viewport.top, viewport.left)
+        else:
+            return False
+        if is_changed:
+            self.create_tiles()
+            self.draw_grid(full=True)
+        return True
+
+    def draw_grid(self, full=False):
+        """
+        Draws the cells in view that changed since the previous call and updates them on the display.
+
+        When more than a quarter of the cells in view changed, the whole view is drawn at once from
+        an array of pixels, which is faster than blitting that many tiles.
+
+        Args:
+            full (bool, optional): Redraw the whole view. Defaults to False.
+        """
+        top, bottom, left, right = self.viewport.visible()
+        if full or self.is_dirty or len(self.dirty_nodes) > self.dirty_limit():
+            self.dirty_nodes.clear()
+            self.is_dirty = False
+            self.draw_full_grid()
+            pygame.display.flip()
+            return
+        nodes = [node for node in self.dirty_nodes if top <= node[0] < bottom and left <= node[1] < right]
+        self.dirty_nodes.clear()
+        rects = []
+        if self.viewport.is_detailed:
+            for node in nodes:
+                rect = self.cell_rect(node)
+                self.screen.blit(self.tiles.get(self.grid[node], self.tiles[None]), rect)
+                rects.append(rect)
+        else:
+            # Recolor each pixel from the whole block of cells it stands for
+            block = self.viewport.block
+            cells = self.cell_array()
+            for row, col in set((row - row % block, col - col % block) for row, col in nodes):
+                rect = self.cell_rect((row, col))
+                self.screen.fill(self.rank_colors[self.ranks[cells[row:row + block, col:col + block]].max()], rect)
+                rects.append(rect)
+        pygame.display.update(rects)
+
+    def dirty_limit(self):
+        """ Gets the number of changed cells above which the whole view is drawn at once, a quarter of the cells in view. """
+        top, bottom, left, right = self.viewport.visible()
+        return (bottom - top) * (right - left) // 4
+
+    def draw_full_grid(self):
+        """ Draws the cells in view at once from an array of pixels. """
+        viewport = self.viewport
+        top, bottom, left, right = viewport.visible()
+        cells = self.cell_array()[top:bottom, left:right]
+        pixels = np.zeros((viewport.size[0], viewport.size[1], 3), dtype=np.uint8)
+
+        if viewport.is_detailed:
+            lookup = np.zeros((256, 3), dtype=np.uint8)
+            lookup[:] = self.color_default
+            for state, color in self.colors.items():
+                lookup[ord(state)] = color
+
+            # Map every pixel to the cell containing it, if not in a margin
+            x = np.arange(viewport.size[0]) - viewport.cell_margin
+            y = np.arange(viewport.size[1]) - viewport.cell_margin
+            cols = x // viewport.pitch
+            rows = y // viewport.pitch
+            is_col = (x >= 0) & (x % viewport.pitch < viewport.cell_size) & (cols < right - left)
+            is_row = (y >= 0) & (y % viewport.pitch < viewport.cell_size) & (rows < bottom - top)
+            pixels[np.ix_(is_col, is_row)] = lookup[cells[np.ix_(rows[is_row], cols[is_col])]].transpose(1, 0, 2)
+        else:
+            # Downsample blocks of cells to one pixel each, keeping the most important state
+            block = viewport.block
+            ranks = self.ranks[cells]
+            if block > 1:
+                height = -(-(bottom - top) // block)
+                width = -(-(right - left) // block)
+                padded = np.zeros((height * block, width * block), dtype=np.uint8)
+                padded[:bottom - top, :right - left] = ranks
+                ranks = padded.reshape(height, block, width, block).max(axis=(1, 3))
+            ranks = ranks[:viewport.size[1], :viewport.size[0]]
+            pixels[:ranks.shape[1], :ranks.shape[0]] = self.rank_colors[ranks].transpose(1, 0, 2)
+        pygame.surfarray.blit_array(self.screen, pixels)
 
     def check_position(self, state):
         """ Checks locations where state occurs. """
-        position = []
-        for row in range(self.rows):
-            for col in range(self.columns):
-                if (self.grid[row][col] == state):
-                    if state == self.state_start or state == self.state_goal:
-                        return (row, col)
-                    position.append((row, col))
-        return position
+        if state == self.state_start or state == self.state_goal:
+            position = self.grid.find(state, count=1)
+            return position[0] if position else position
+        return self.grid.find(state)
 
     def load(self, name):
-        """ Loads grid from file. """
-        with open(name, 'r') as file:
-            self.grid = [line.strip().split(',') for line in file]
+        """ Loads grid from a text file or a binary .maze file. """
+        self.cache.invalidate(digest(self.grid))
+        self.grid = Grid.load(name)
+        self.planner = None
+        self.edited_nodes = []
+        self.reachability = None
 
         # Redefine grid properties
-        self.rows = len(self.grid)
-        self.columns = len(self.grid[0])
+        self.rows = self.grid.rows
+        self.columns = self.grid.columns
         self.size = ((self.height + self.margin) * self.columns, (self.width + self.margin) * self.rows + self.margin)
 
     def save(self, name):
-        """ Saves maze as text file with filename name. """
+        """ Saves maze as text file with filename name, or as binary file if the extension is .maze. """
         # Check position of start, goal and blocked nodes
         start_node = self.check_position(self.state_start)
         goal_node = self.check_position(self.state_goal)
         blocked_nodes = self.check_position(self.state_blocked)
 
         # Create new maze
-        new_maze = [['0' for col in range(self.columns)] for row in range(self.rows)]
-        new_maze[start_node[0]][start_node[1]] = self.state_start
-        new_maze[goal_node[0]][goal_node[1]] = self.state_goal
+        new_maze = Grid(self.rows, self.columns)
+        new_maze[start_node] = self.state_start
+        new_maze[goal_node] = self.state_goal
+        for extra_node in self.grid.find(self.state_start)[1:]:
+            new_maze[extra_node] = self.state_start
+        for extra_node in self.grid.find(self.state_goal)[1:]:
+            new_maze[extra_node] = self.state_goal
         for blocked_node in blocked_nodes:
-            new_maze[blocked_node[0]][blocked_node[1]] = self.state_blocked
+            new_maze[blocked_node] = self.state_blocked
+        for weight in "23456789":
+            for weighted_node in self.check_position(weight):
+                new_maze[weighted_node] = weight
 
         # Save file
-        with open(name, 'w') as file:
-            for row in new_maze:
-                for idx, col in enumerate(row):
-                    if idx == 0:
-                        file.write(col)
-                    else:
-                        file.write("," + col)
-                file.write("\n")
+        new_maze.save(name)
 
-    def run(self, is_expansion, algorithm):
+    def run(self, is_expansion, algorithm, trace_name=None):
         """
         Runs the pathfinder algorithm.
 
         Args:
-            is_expansion (bool): Node expansion is visible or not.
-            algorithm ([type]): Algorithm to solve the maze.
+            is_expansion (bool): Node expansion is hidden or not.
+            algorithm (str): Algorithm to solve the maze.
+            trace_name (str, optional): File where the search is saved as a trace once it finishes. Defaults to None.
+
+        Raises:
+            ValueError: If the maze has several starts or goals and the algorithm cannot search them at once.
+            RuntimeError: If the search failed, once the window is closed.
         """
+        # Initialize nodes, searching from every start to the nearest goal if there are several
+        self.start_nodes = self.grid.find(self.state_start)
+        self.goal_nodes = self.grid.find(self.state_goal)
+        self.start_node = self.start_nodes[0] if self.start_nodes else None
+        self.goal_node = self.goal_nodes[0] if self.goal_nodes else None
+        is_nearest = len(self.start_nodes) > 1 or len(self.goal_nodes) > 1
+        if is_nearest and not supports_nearest(algorithm):
+            raise ValueError("{} cannot search from several starts or to several goals".format(algorithm))
+
         # Initialize pygame
-        pygame.init()
-        self.screen = pygame.display.set_mode(self.size)
-        pygame.display.set_caption(self.title)
+        self.open_window()
 
-        # Initialize algorithm
-        if algorithm == "Breadth-first search (BFS)":
-            solve_maze = self.breadth_first_search
-            self.cost_grid = self.calculate_cost_grid(None)
-        elif algorithm == "Depth-first search (DFS)":
-            solve_maze = self.depth_first_search
-            self.cost_grid = self.calculate_cost_grid(None)
-        elif algorithm == "Dijkstra's algorithm":
-            solve_maze = self.dijkstra
-            self.cost_grid = self.calculate_cost_grid("cost")
-        elif algorithm == "Greedy best-first search (GBFS)":
-            solve_maze = self.greedy_best_first_search
-            self.cost_grid = self.calculate_cost_grid("heuristic")
-        elif algorithm == "A*":
-            solve_maze = self.a_star
-            self.cost_grid = self.calculate_cost_grid("cost+heuristic")
-
-        # Initialize nodes
-        self.start_node = self.check_position(self.state_start)
-        self.goal_node = self.check_position(self.state_goal)
-        self.open_nodes = [(self.start_node, self.get_cost_node(self.cost_grid, self.start_node))]
-        self.closed_nodes = []
-        self.best_path = {}
-
-        # Initialize actions
-        self.actions = {"UP": (-1, 0), "DOWN": (1, 0), "LEFT": (0, -1), "RIGHT": (0, 1)}
+        # Save maze copy, also read by the solver
+        self.grid_backup = self.grid.copy()
 
-        # Save maze copy
-        self.grid_backup = [row.copy() for row in self.grid]
+        # Solve maze in the background, publishing expansion events to a bounded buffer
+        self.events = queue.Queue(maxsize=EVENT_BUFFER)
+        self.next_event = None
+        self.result = None
+        self.error = None
+        self.cancelled = threading.Event()
+        self.trace = Trace(self.rows, self.columns) if trace_name else None
+        solver = threading.Thread(target=self.solve, args=(algorithm, is_expansion, is_nearest), daemon=True)
+        solver.start()
 
         # Run loop
         self.clock = pygame.time.Clock()
         is_running = True
+        is_paused = False
         is_maze_solved = False
 
         # Maze loop
         while is_running:
+            expansions = self.speed
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     is_running = False
+                elif self.view_event(event):
+                    continue
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE:
+                        is_paused = not is_paused
+                    elif event.key == pygame.K_RIGHT:
+                        expansions += 1
+                    elif event.key in (pygame.K_UP, pygame.K_PLUS, pygame.K_EQUALS):
+                        self.speed *= 2
+                    elif event.key in (pygame.K_DOWN, pygame.K_MINUS):
+                        self.speed = max(1, self.speed // 2)
+                    elif event.key == pygame.K_ESCAPE:
+                        self.cancelled.set()
+                        self.next_event = None
+                        is_maze_solved = True
+                    pygame.display.set_caption("{} ({} expansions per frame{})".format(self.title, self.speed, ", paused" if is_paused else ""))
+            if is_paused:
+                expansions -= self.speed
             if not is_maze_solved:
-                if is_expansion:
-                    while True:
-                        is_maze_solved = solve_maze()
-                        self.clear_maze()
-                        if is_maze_solved:
-                            for (x, y) in self.full_path[:-1]:
-                                self.grid[x][y] = self.state_path
-                            break
-                else:
-                    is_maze_solved = solve_maze()
+                is_maze_solved = self.draw_events(expansions)
             self.draw_grid()
-            pygame.display.flip()
-            self.clock.tick(10)
+            self.clock.tick(self.fps)
+        self.cancelled.set()
+        solver.join()
         pygame.quit()
         self.clear_maze()
 
-    def set_node(self, node, state):
-        """ Sets node to be at a given state. """
-        if self.grid[node[0]][node[1]] != self.state_start and self.grid[node[0]][node[1]] != self.state_goal:
-            self.grid[node[0]][node[1]] = state
-
-    def generate_path(self, current_node):
-        """ Generates optimal path from goal to beginning. """
-        self.full_path = []
-        while current_node in self.best_path.keys():
-            current_node = self.best_path[current_node]
-            self.full_path.append(current_node)
-
-    def calculate_cost_grid(self, method):
-        """ Calculates cost at position using a given method. """
-        goal_node = self.check_position(self.state_goal)
-        total_cost = []
-        if method == "cost":
-            total_cost = [[self.cost for col in range(self.columns)] for row in range(self.rows)]
-        elif method == "heuristic":
-            total_cost = [[abs(goal_node[0] - row) + abs(goal_node[1] - col) for col in range(self.columns)] for row in range(self.rows)]
-        elif method == "cost+heuristic":
-            total_cost = [[abs(goal_node[0] - row) + abs(goal_node[1] - col) + self.cost for col in range(self.columns)] for row in range(self.rows)]
+        # Save the search if it finished, or report why it failed
+        if self.error is not None:
+            raise RuntimeError("{} failed: {!r}".format(algorithm, self.error)) from self.error
+        if self.trace is not None:
+            self.trace.save(trace_name)
+
+    def solve(self, algorithm, is_expansion, is_nearest=False):
+        """
+        Solves the maze, publishing expansion events. Runs in a background thread.
+
+        Args:
+            is_expansion (bool): Node expansion is hidden or not.
+            algorithm (str): Algorithm to solve the maze.
+            is_nearest (bool, optional): Search from every start to the nearest goal at once. Defaults to False.
+        """
+        def on_expand(node):
+            if self.cancelled.is_set():
+                raise SearchCancelled
+            if self.trace is not None:
+                self.trace.expand(node)
+            if not is_expansion:
+                self.publish((self.state_explored, node))
+
+        def on_visit(node):
+            if self.trace is not None:
+                self.trace.visit(node)
+            if not is_expansion:
+                self.publish((self.state_visited, node))
+
+        # Visits are only needed to show or record them
+        if is_expansion and self.trace is None:
+            on_visit = None
+
+        try:
+            if self.reachability is None:
+                self.reachability = ReachabilityIndex(self.grid_backup)
+            if is_nearest:
+                result = solve_nearest(self.grid_backup, self.start_nodes, self.goal_nodes, algorithm, self.cost,
+                                       on_expand=on_expand, on_visit=on_visit)
+            elif algorithm == "D* Lite (incremental)":
+                result = self.replan(on_expand)
+            else:
+                result = self.cache.solve(self.grid_backup, self.start_node, self.goal_node, algorithm, self.cost,
+                                          on_expand=on_expand, on_visit=on_visit,
+                                          reachability=self.reachability)
+            if self.trace is not None and result is not None:
+                self.trace.path(result.path)
+        except SearchCancelled:
+            self.planner = None
+            self.trace = None
+            return
+        except Exception as error:
+            # Report the failure to the window instead of leaving it waiting for the result
+            self.planner = None
+            self.trace = None
+            result = error
+        try:
+            self.publish((None, result))
+        except SearchCancelled:
+            pass
+
+    def publish(self, event):
+        """
+        Publishes an event of the solver to the window, waiting while the buffer is full.
+
+        Raises:
+            SearchCancelled: If the search is cancelled before the event is published.
+        """
+        while not self.cancelled.is_set():
+            try:
+                self.events.put(event, timeout=PUBLISH_TIMEOUT)
+                return
+            except queue.Full:
+                pass
+        raise SearchCancelled
+
+    def draw_events(self, expansions):
+        """
+        Applies the events published by the solver until a number of expansions are shown.
+        An event read past the last expansion shown is kept for the next call.
+
+        Returns:
+            bool: Whether the search finished or failed.
+        """
+        while True:
+            if self.next_event is None:
+                try:
+                    self.next_event = self.events.get_nowait()
+                except queue.Empty:
+                    return False
+            state, node = self.next_event
+            if state == self.state_explored:
+                if expansions <= 0:
+                    return False
+                expansions -= 1
+            self.next_event = None
+            if isinstance(node, Exception):
+                self.error = node
+                pygame.display.set_caption("{} (search failed)".format(self.title))
+                return True
+            if state is None:
+                self.result = node
+                if self.result is not None:
+                    for path_node in self.result.path[1:-1]:
+                        self.set_node(path_node, self.state_path)
+                return True
+            self.set_node(node, state)
+
+    def replay(self, trace):
+        """
+        Replays a search trace recorded on this maze.
+
+        Keys are the same as when running a search, plus Left to go back one event, Home and End
+        to go to the beginning and the end, and 0-9 to go to that tenth of the trace.
+        Seeking restores the nearest snapshot of the maze taken while replaying, then applies the events after it.
+
+        Args:
+            trace (Trace): Recorded search.
+        """
+        if (trace.rows, trace.columns) != (self.rows, self.columns):
+            raise ValueError("Trace of a {}x{} maze cannot be replayed on a {}x{} maze".format(trace.rows, trace.columns, self.rows, self.columns))
+        states = {EXPAND: self.state_explored, VISIT: self.state_visited, PATH: self.state_path}
+
+        # Initialize pygame
+        self.open_window()
+
+        # Save maze copy
+        self.grid_backup = self.grid.copy()
+
+        # Run loop
+        self.clock = pygame.time.Clock()
+        is_running = True
+        is_paused = False
+        position = 0
+        events = trace.events()
+        next_event = None
+        snapshots = Snapshots(self.grid)
+
+        # Replay loop
+        while is_running:
+            expansions = self.speed
+            seek = None
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    is_running = False
+                elif self.view_event(event):
+                    continue
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE:
+                        is_paused = not is_paused
+                    elif event.key == pygame.K_RIGHT:
+                        expansions += 1
+                    elif event.key == pygame.K_LEFT:
+                        seek = max(position - 1, 0)
+                    elif event.key in (pygame.K_UP, pygame.K_PLUS, pygame.K_EQUALS):
+                        self.speed *= 2
+                    elif event.key in (pygame.K_DOWN, pygame.K_MINUS):
+                        self.speed = max(1, self.speed // 2)
+                    elif event.key == pygame.K_HOME:
+                        seek = 0
+                    elif event.key == pygame.K_END:
+                        seek = len(trace)
+                    elif pygame.K_0 <= event.key <= pygame.K_9:
+                        seek = len(trace) * (event.key - pygame.K_0) // 10
+                    pygame.display.set_caption("{} ({} expansions per frame{})".format(self.title, self.speed, ", paused" if is_paused else ""))
+            if is_paused:
+                expansions -= self.speed
+
+            # Jump to an event from the nearest snapshot before it
+            if seek is not None:
+                self.grid = self.grid_backup.copy()
+                position = snapshots.restore(self.grid, seek)
+                while position < seek:
+                    stop = min(seek, position - position % SNAPSHOT + SNAPSHOT)
+                    self.apply_events(trace, position, stop, states)
+                    position = stop
+                    snapshots.update(self.grid, position)
+                events = trace.events(position)
+                next_event = None
+                expansions = 0
+                self.draw_grid(full=True)
+
+            # Apply events until the expansion after the last one shown
+            while True:
+                if next_event is None:
+                    next_event = next(events, None)
+                    if next_event is None:
+                        break
+                kind, node = next_event
+                if kind == EXPAND:
+                    if expansions <= 0:
+                        break
+                    expansions -= 1
+                self.set_node(node, states[kind])
+                position += 1
+                snapshots.update(self.grid, position)
+                next_event = None
+
+            self.draw_grid()
+            self.clock.tick(self.fps)
+        pygame.quit()
+        self.clear_maze()
+
+    def apply_events(self, trace, start, stop, states):
+        """ Applies a range of events of a trace at once, leaving starts and goals in place. """
+        indices = []
+        codes = []
+        for kind, (row, col) in trace.events(start, stop):
+            indices.append(row * self.columns + col)
+            codes.append(ord(states[kind]))
+        indices = np.array(indices, dtype=np.int64)
+        cells = Snapshots.cells(self.grid)
+        is_kept = (cells[indices] != ord(self.state_start)) & (cells[indices] != ord(self.state_goal))
+        cells[indices[is_kept]] = np.array(codes, dtype=np.uint8)[is_kept]
+        self.grid.content_digest = None
+
+    def replan(self, on_expand=None):
+        """ Repairs the path of the incremental planner with the cells edited since the previous run. """
+        if self.planner is None or self.planner.goal != self.goal_node:
+            self.planner = IncrementalPlanner(self.grid_backup, self.start_node, self.goal_node, self.cost)
         else:
-            total_cost = [[0 for col in range(self.columns)] for row in range(self.rows)]
+            self.planner.update(self.edited_nodes)
+            if self.planner.start != self.start_node:
+                self.planner.move(self.start_node)
+        self.edited_nodes = []
+        return self.planner.plan(on_expand)
 
-        return total_cost
+    def edit_node(self, node, state):
+        """
+        Sets the state of a node in the editor.
 
-    def get_cost_node(self, cost_grid, node):
-        """ Gets cost of a given node. """
-        return cost_grid[node[0]][node[1]]
+        A change of weight is recorded for the incremental planner, and opening or blocking the node
+        updates the reachability index.
+        """
+        previous = self.grid[node]
+        if previous == state:
+            return
+        self.grid[node] = state
+        self.dirty_nodes.add(node)
+        if WEIGHT_TABLE[ord(previous)] != WEIGHT_TABLE[ord(state)]:
+            self.edited_nodes.append((node, state))
+            if self.reachability is not None:
+                self.reachability.set_state(node, state)
 
-    def get_actions(self, current_node):
-        """ Gets available actions of a given node. """
-        possible_actions = []
-        for action in self.actions.values():
-            new_x = current_node[0] + action[0]
-            new_y = current_node[1] + action[1]
-            if (new_x >= 0 and new_x < self.rows and new_y >= 0 and new_y < self.columns and self.grid[new_x][new_y] != self.state_blocked):
-                possible_actions.append((new_x, new_y))
-        return possible_actions
+    def set_node(self, node, state):
+        """ Sets node to be at a given state. """
+        if self.grid[node] != self.state_start and self.grid[node] != self.state_goal:
+            self.grid[node] = state
+            self.dirty_nodes.add(node)
 
     def clear_maze(self):
-        """ Resets maze grid. """
-        self.grid = [row.copy() for row in self.grid_backup]
-
-    def a_star(self):
-        """ Runs the A* algorithm. """  # TODO: Move algorithms to module algorithms.py
-        current_node, _ = self.open_nodes.pop(0)
-        if (current_node == self.goal_node):
-            self.generate_path(current_node)
-            for (x, y) in self.full_path[:-1]:
-                self.grid[x][y] = self.state_path
-            return True
-        self.closed_nodes.append(current_node)
-        self.set_node(current_node, self.state_explored)
-        for next_state in self.get_actions(current_node):
-            next_cost = self.get_cost_node(self.cost_grid, next_state)
-            if (next_state, next_cost) not in self.open_nodes and next_state not in self.closed_nodes:
-                self.best_path[next_state] = current_node
-                self.set_node(next_state, self.state_visited)
-                self.open_nodes.append((next_state, next_cost))
-        self.open_nodes.sort(key=lambda x: x[1])
-        return False
-
-    def breadth_first_search(self):
-        """ Runs the BFS algorithm. """
-        current_node, _ = self.open_nodes.pop(0)
-        if (current_node == self.goal_node):
-            self.generate_path(current_node)
-            for (x, y) in self.full_path[:-1]:
-                self.grid[x][y] = self.state_path
-            return True
-        self.closed_nodes.append(current_node)
-        self.set_node(current_node, self.state_explored)
-        for next_state in self.get_actions(current_node):
-            if (next_state, 0) not in self.open_nodes and next_state not in self.closed_nodes:
-                self.best_path[next_state] = current_node
-                self.set_node(next_state, self.state_visited)
-                self.open_nodes.append((next_state, 0))
-        return False
-
-    def depth_first_search(self):
-        """ Runs the DFS algorithm. """ 
-        current_node, _ = self.open_nodes.pop(-1)
-        if (current_node == self.goal_node):
-            self.generate_path(current_node)
-            for (x, y) in self.full_path[:-1]:
-                self.grid[x][y] = self.state_path
-            return True
-        self.closed_nodes.append(current_node)
-        self.set_node(current_node, self.state_explored)
-        for next_state in self.get_actions(current_node):
-            if (next_state, 0) not in self.open_nodes and next_state not in self.closed_nodes:
-                self.best_path[next_state] = current_node
-                self.set_node(next_state, self.state_visited)
-                self.open_nodes.append((next_state, 0))
-        return False
-
-    def dijkstra(self):
-        """ Runs the Dijkstra algorithm. """
-        current_node, _ = self.open_nodes.pop(0)
-        if (current_node == self.goal_node):
-            self.generate_path(current_node)
-            for (x, y) in self.full_path[:-1]:
-                self.grid[x][y] = self.state_path
-            return True
-        self.closed_nodes.append(current_node)
-        self.set_node(current_node, self.state_explored)
-        for next_state in self.get_actions(current_node):
-            next_cost = self.get_cost_node(self.cost_grid, next_state)
-            if (next_state, next_cost) not in self.open_nodes and next_state not in self.closed_nodes:
-                self.best_path[next_state] = current_node
-                self.set_node(next_state, self.state_visited)
-                self.open_nodes.append((next_state, next_cost))
-        self.open_nodes.sort(key=lambda x: x[1])
-        return False
-
-    def greedy_best_first_search(self):
-        """ Runs the GBFS algorithm. """
-        current_node, _ = self.open_nodes.pop(0)
-        if (current_node == self.goal_node):
-            self.generate_path(current_node)
-            for (x, y) in self.full_path[:-1]:
-                self.grid[x][y] = self.state_path
-            return True
-        self.closed_nodes.append(current_node)
-        self.set_node(current_node, self.state_explored)
-        for next_state in self.get_actions(current_node):
-            next_cost = self.get_cost_node(self.cost_grid, next_state)
-            if (next_state, next_cost) not in self.open_nodes and next_state not in self.closed_nodes:
-                self.best_path[next_state] = current_node
-                self.set_node(next_state, self.state_visited)
-                self.open_nodes.append((next_state, next_cost))
-        self.open_nodes.sort(key=lambda x: x[1])
-        return False
+        """ Resets maze grid, marking the whole view for redrawing instead of listing the cells if too many changed. """
+        size = self.rows * self.columns
+        current = np.frombuffer(self.grid.cells, np.uint8, size, self.grid.offset)
+        backup = np.frombuffer(self.grid_backup.cells, np.uint8, size, self.grid_backup.offset)
+        changed = np.flatnonzero(current != backup)
+        if len(changed) + len(self.dirty_nodes) > self.dirty_limit():
+            self.dirty_nodes.clear()
+            self.is_dirty = True
+        else:
+            self.dirty_nodes.update(divmod(int(index), self.columns) for index in changed)
+        self.grid = self.grid_backup.copy()
 
     def edit(self):
         """ Edits the maze. """
         # Initialize pygame
-        pygame.init()
-        self.screen = pygame.display.set_mode(self.size)
-        pygame.display.set_caption(self.title)
+        self.open_window()
 
-        has_start = any([self.state_start in row for row in self.grid])
-        has_goal = any([self.state_goal in row for row in self.grid])
+        has_start = bool(self.grid.find(self.state_start, count=1))
+        has_goal = bool(self.grid.find(self.state_goal, count=1))
+        maze_digest = digest(self.grid)
 
         # Run loop
         is_running = True
         self.clock = pygame.time.Clock()
         while is_running:
             for event in pygame.event.get():
+                is_over_maze = self.viewport.cell_at(pygame.mouse.get_pos()) is not None
                 if event.type == pygame.QUIT:
                     is_running = False
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if not has_start:
-                    mousex, mousey = pygame.mouse.get_pos()
-                    start_node = (mousey // (self.height + self.margin), mousex // (self.width + self.margin))
-                    if self.grid[start_node[0]][start_node[1]] != self.state_goal:
-                        self.grid[start_node[0]][start_node[1]] = self.state_start
-                        has_start = True
-                elif not has_goal:
-                    mousex, mousey = pygame.mouse.get_pos()
-                    goal_node = (mousey // (self.height + self.margin), mousex // (self.width + self.margin))
-                    if self.grid[goal_node[0]][goal_node[1]] != self.state_start:
-                        self.grid[goal_node[0]][goal_node[1]] = self.state_goal
-                        has_goal = True
-                else:
-                    if has_start and has_goal:
-                        mousex, mousey = pygame.mouse.get_pos()
-                        barrier_node = (mousey // (self.height + self.margin), mousex // (self.width + self.margin))
-                        if self.grid[barrier_node[0]][barrier_node[1]] == self.state_blocked:
-                            self.grid[barrier_node[0]][barrier_node[1]] = 0
-                        elif self.grid[barrier_node[0]][barrier_node[1]] == self.state_start and has_goal:
-                            self.grid[barrier_node[0]][barrier_node[1]] = 0
-                            has_start = False
-                        elif self.grid[barrier_node[0]][barrier_node[1]] == self.state_goal and has_start:
-                            self.grid[barrier_node[0]][barrier_node[1]] = 0
-                            has_goal = False
-                        elif self.grid[barrier_node[0]][barrier_node[1]] != self.state_start and self.grid[barrier_node[0]][barrier_node[1]] != self.state_start:
-                            self.grid[barrier_node[0]][barrier_node[1]] = self.state_blocked
+                elif self.view_event(event):
+                    continue
+                elif event.type == pygame.KEYDOWN and pygame.K_1 <= event.key <= pygame.K_9 and is_over_maze:
+                    # Set weight of the cell under the mouse, 1 being an empty cell
+                    weighted_node = self.viewport.cell_at(pygame.mouse.get_pos())
+                    if self.grid[weighted_node] != self.state_start and self.grid[weighted_node] != self.state_goal:
+                        self.edit_node(weighted_node, '0' if event.key == pygame.K_1 else chr(event.key))
+                elif event.type == pygame.KEYDOWN and event.key in (pygame.K_s, pygame.K_g) and has_start and has_goal and is_over_maze:
+                    # Add another start or goal under the mouse
+                    extra_node = self.viewport.cell_at(pygame.mouse.get_pos())
+                    if self.grid[extra_node] != self.state_start and self.grid[extra_node] != self.state_goal:
+                        state = self.state_start if event.key == pygame.K_s else self.state_goal
+                        self.edit_node(extra_node, state)
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and is_over_maze:
+                    if not has_start:
+                        start_node = self.viewport.cell_at(pygame.mouse.get_pos())
+                        if self.grid[start_node] != self.state_goal:
+                            self.edit_node(start_node, self.state_start)
+                            has_start = True
+                    elif not has_goal:
+                        goal_node = self.viewport.cell_at(pygame.mouse.get_pos())
+                        if self.grid[goal_node] != self.state_start:
+                            self.edit_node(goal_node, self.state_goal)
+                            has_goal = True
+                    else:
+                        if has_start and has_goal:
+                            barrier_node = self.viewport.cell_at(pygame.mouse.get_pos())
+                            if self.grid[barrier_node] == self.state_blocked:
+                                self.edit_node(barrier_node, '0')
+                            elif self.grid[barrier_node] == self.state_start and has_goal:
+                                self.edit_node(barrier_node, '0')
+                                has_start = bool(self.grid.find(self.state_start, count=1))
+                            elif self.grid[barrier_node] == self.state_goal and has_start:
+                                self.edit_node(barrier_node, '0')
+                                has_goal = bool(self.grid.find(self.state_goal, count=1))
+                            else:
+                                self.edit_node(barrier_node, self.state_blocked)
             self.draw_grid()
-            pygame.display.flip()
-            self.clock.tick(10)
+            self.clock.tick(self.fps)
         pygame.quit()
+
+        # Drop cached results of the maze before editing
+        if digest(self.grid) != maze_digest:
+            self.cache.invalidate(maze_digest)
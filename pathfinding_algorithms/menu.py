@@ -3,6 +3,7 @@ import tkinter.ttk as ttk
 import tkinter.filedialog
 from tkinter import messagebox
 from .maze import MazeWindow
+from .trace import Trace
 
 
 class MenuWindow(tk.Frame):
@@ -69,7 +70,7 @@ class MenuWindow(tk.Frame):
         self.bottom_frame.pack(padx=5, pady=5, fill="both", expand="yes")
 
         # Bottom frame – Combobox
-        self.combobox = ttk.Combobox(self.bottom_frame, width=25, state="readonly", values=["Breadth-first search (BFS)", "Depth-first search (DFS)", "Dijkstra's algorithm", "Greedy best-first search (GBFS)", "A*"])
+        self.combobox = ttk.Combobox(self.bottom_frame, width=25, state="readonly", values=["Breadth-first search (BFS)", "Depth-first search (DFS)", "Dijkstra's algorithm", "Greedy best-first search (GBFS)", "A*", "Jump point search (JPS)", "Bidirectional BFS", "Bidirectional A*", "D* Lite (incremental)"])
         self.combobox.current(0)
         self.combobox.grid(row=0, columnspan=2, padx=(10, 0))
 
@@ -77,10 +78,15 @@ class MenuWindow(tk.Frame):
         self.is_expansion = tk.BooleanVar()
         self.checkbox = tk.Checkbutton(self.bottom_frame, text="Hide node expansion", variable=self.is_expansion)
         self.checkbox.grid(row=1, column=0, padx=(10, 10), pady=(10, 0))
+        self.is_traced = tk.BooleanVar()
+        self.trace_checkbox = tk.Checkbutton(self.bottom_frame, text="Save trace", variable=self.is_traced)
+        self.trace_checkbox.grid(row=2, column=0, padx=(10, 10), pady=(10, 0), sticky="w")
 
         # Bottom frame – Button
         self.run_button = tk.Button(self.bottom_frame, width=8, text="Run", command=self.run_algorithm)
         self.run_button.grid(row=1, column=1, pady=(10, 0))
+        self.replay_button = tk.Button(self.bottom_frame, width=8, text="Replay", command=self.replay_trace)
+        self.replay_button.grid(row=1, column=2, padx=(5, 0), pady=(10, 0))
 
         # Get screen dimensions
         screen_width = self.parent.winfo_screenwidth()
@@ -100,7 +106,7 @@ class MenuWindow(tk.Frame):
                                        columns=self.columns_entry.get(),
                                        width=self.width_entry.get(),
                                        margin=self.margin_entry.get())
-            self.parent.filename = tkinter.filedialog.askopenfilename(initialdir="./Mazes", title="Select a maze", filetypes=(("txt files", "*.txt"),))
+            self.parent.filename = tkinter.filedialog.askopenfilename(initialdir="./Mazes", title="Select a maze", filetypes=(("txt files", "*.txt"), ("maze files", "*.maze")))
             self.maze.load(self.parent.filename)
             messagebox.showinfo("File loaded", "File loaded successfully!", parent=self)
         except FileNotFoundError:
@@ -121,14 +127,38 @@ class MenuWindow(tk.Frame):
     def save_maze(self):
         """ Saves maze to file. """
         try:
-            self.parent.filename = tkinter.filedialog.asksaveasfilename(initialdir=".", title="Save maze", filetypes=(("txt files", "*.txt"),))
+            self.parent.filename = tkinter.filedialog.asksaveasfilename(initialdir=".", title="Save maze", filetypes=(("txt files", "*.txt"), ("maze files", "*.maze")))
             self.maze.save(self.parent.filename)
             messagebox.showerror("File saved", "Maze saved as {}".format(self.parent.filename), parent=self)
         except AttributeError:
             messagebox.showerror("File error", "There is no maze to save! Please, create first a maze.", parent=self)
 
     def run_algorithm(self):
-        if self.maze and any([self.maze.state_start in row for row in self.maze.grid]):
-            self.maze.run(self.is_expansion.get(), self.combobox.get())
+        """ Runs the selected algorithm, first asking where to save the trace of the search if requested. """
+        if self.maze and self.maze.grid.find(self.maze.state_start, count=1):
+            trace_name = None
+            if self.is_traced.get():
+                trace_name = tkinter.filedialog.asksaveasfilename(initialdir=".", title="Save trace", defaultextension=".trace", filetypes=(("trace files", "*.trace"),))
+                if not trace_name:
+                    return
+            try:
+                self.maze.run(self.is_expansion.get(), self.combobox.get(), trace_name)
+            except ValueError as error:
+                messagebox.showerror("Algorithm error", "{}. Please, choose BFS, Dijkstra's algorithm or A*.".format(error), parent=self)
+            except OSError as error:
+                messagebox.showerror("File error", "Trace could not be saved! {}".format(error), parent=self)
+            except RuntimeError as error:
+                messagebox.showerror("Algorithm error", "{}.".format(error), parent=self)
         else:
             messagebox.showerror("File error", "There is no maze available! Please, create first a maze.", parent=self)
+
+    def replay_trace(self):
+        """ Replays a search trace on the current maze. """
+        if not self.maze:
+            messagebox.showerror("File error", "There is no maze available! Please, create first a maze.", parent=self)
+            return
+        try:
+            self.parent.filename = tkinter.filedialog.askopenfilename(initialdir=".", title="Select a trace", filetypes=(("trace files", "*.trace"),))
+            self.maze.replay(Trace.load(self.parent.filename))
+        except (FileNotFoundError, ValueError) as error:
+            messagebox.showerror("File error", "Trace could not be replayed! {}".format(error), parent=self)
@@ -0,0 +1,75 @@
+""" Searches from several starts to the nearest of several goals. """
+import time
+from array import array
+
+import numpy as np
+
+from .algorithms import ALIASES, Layout, SearchResult, multi_source_breadth_first_search, multi_source_bucket_search, walk
+from .distance import nearest_heuristic_grid
+
+
+# Algorithms that can search from several starts to several goals
+NEAREST = ("bfs", "dijkstra", "a*")
+
+
+def supports_nearest(algorithm):
+    """ Checks whether an algorithm, or its menu name, can search from several starts to several goals. """
+    return ALIASES.get(algorithm, algorithm) in NEAREST
+
+
+def nearest_heuristics(layout, goals):
+    """ Gets the Manhattan distance to the nearest goal of every flat index of a layout. """
+    padded = np.zeros((layout.rows + 2, layout.stride), dtype=np.int32)
+    padded[1:-1, 1:-1] = nearest_heuristic_grid(layout.rows, layout.columns, goals)
+    return array('i', padded.tobytes())
+
+
+def solve_nearest(grid, starts, goals, algorithm="a*", cost=1, on_expand=None, on_visit=None):
+    """
+    Finds the shortest path from any of the starts to the nearest goal with a single search.
+
+    The frontier is seeded with every start, and A* is guided by the Manhattan distance to the nearest goal.
+
+    Args:
+        grid (Grid, list or Layout): Maze grid or rows of cell states.
+        starts (list): Start cells (row, col).
+        goals (list): Goal cells (row, col).
+        algorithm (str, optional): One of NEAREST or its menu name. Defaults to "a*".
+        cost (int, optional): Cost of moving into a cell of weight 1. Defaults to 1.
+        on_expand (callable, optional): Called with each expanded cell. Defaults to None.
+        on_visit (callable, optional): Called with each cell added to the frontier. Defaults to None.
+
+    Returns:
+        SearchResult: Path found, whose first and last cells are the winning start and goal.
+            Blocked starts and goals are ignored.
+
+    Raises:
+        ValueError: If the algorithm cannot search from several starts or a cell is outside the maze.
+    """
+    if not supports_nearest(algorithm):
+        raise ValueError("{} cannot search from several starts to several goals".format(algorithm))
+    name = ALIASES.get(algorithm, algorithm)
+    begin = time.perf_counter()
+    layout = grid if isinstance(grid, Layout) else Layout(grid)
+    for node in list(starts) + list(goals):
+        layout.check(node)
+    starts = [start for start in starts if layout.weights[layout.index(start)]]
+    goals = [goal for goal in goals if layout.weights[layout.index(goal)]]
+    if not starts or not goals:
+        return SearchResult(name, [], None, 0, 0)
+    sources = [layout.index(start) for start in starts]
+    targets = [layout.index(goal) for goal in goals]
+    heuristics = nearest_heuristics(layout, goals) if name == "a*" and len(targets) > 1 else None
+    searched = time.perf_counter()
+
+    if name == "bfs":
+        parents, reached, stats = multi_source_breadth_first_search(layout, sources, targets, on_expand, on_visit)
+    else:
+        parents, reached, stats = multi_source_bucket_search(layout, sources, targets, on_expand, on_visit,
+                                                             use_heuristic=name == "a*", heuristics=heuristics)
+    walked = time.perf_counter()
+
+    path = walk(parents, reached) if parents is not None else []
+    total_cost = sum(layout.weights[index] for index in path[1:]) * cost if path else None
+    stats.times = {"layout": searched - begin, "search": walked - searched, "path": time.perf_counter() - walked}
+    return SearchResult(name, [layout.node(index) for index in path], total_cost, stats.expanded, stats.max_frontier, stats)
@@ -0,0 +1,248 @@
+""" Connected components of the open cells, for rejecting unreachable queries without searching. """
+from collections import deque
+
+import numpy as np
+
+from .algorithms import STATE_BLOCKED
+from .grid import Grid
+
+
+class ReachabilityIndex:
+    """
+    Label of the connected component of every open cell.
+
+    Labels are computed once for the whole maze with array operations. Opening a cell merges the
+    components around it, and blocking a cell only searches the regions around it to find out
+    whether the component was split.
+    """
+    def __init__(self, grid):
+        """
+        Labels the connected components of a maze.
+
+        Args:
+            grid (Grid or list): Maze grid or rows of cell states.
+        """
+        if not isinstance(grid, Grid):
+            grid = Grid.from_rows(grid)
+        self.rows = grid.rows
+        self.columns = grid.columns
+        size = self.rows * self.columns
+        cells = np.frombuffer(grid.cells, np.uint8, size, grid.offset).reshape(self.rows, self.columns)
+        is_open = cells != ord(STATE_BLOCKED)
+
+        # Pairs of adjacent open cells, numbering open cells consecutively
+        count = int(is_open.sum())
+        numbers = np.full((self.rows, self.columns), -1, dtype=np.int32)
+        numbers[is_open] = np.arange(count, dtype=np.int32)
+        horizontal = is_open[:, :-1] & is_open[:, 1:]
+        vertical = is_open[:-1, :] & is_open[1:, :]
+        first = np.concatenate((numbers[:, :-1][horizontal], numbers[:-1, :][vertical]))
+        second = np.concatenate((numbers[:, 1:][horizontal], numbers[1:, :][vertical]))
+        cells = numbers.ravel()
+
+        # Hook every component to its smallest neighboring component and compress the chains, until
+        # no pair of adjacent cells is in different components. Components are renumbered after every
+        # round, so the arrays shrink with their number
+        renumberings = []
+        while True:
+            between = np.flatnonzero(first != second)
+            if not len(between):
+                break
+            first, second = first[between], second[between]
+            parents = np.arange(count, dtype=np.int32)
+            np.minimum.at(parents, np.maximum(first, second), np.minimum(first, second))
+            while True:
+                grandparents = parents[parents]
+                if np.array_equal(grandparents, parents):
+                    break
+                parents = grandparents
+            is_root = parents == np.arange(count, dtype=np.int32)
+            numbers = (np.cumsum(is_root, dtype=np.int32) - 1)[parents]
+            count = int(is_root.sum())
+            first, second = numbers[first], numbers[second]
+            renumberings.append(numbers)
+
+        # Compose the renumberings, from the smallest one, and label the cells. Blocked cells are -1,
+        # which picks the label appended at the end
+        labels = np.arange(count, dtype=np.int32)
+        for numbers in reversed(renumberings):
+            labels = labels[numbers]
+        self.labels = np.append(labels, np.int32(-1))[cells]
+
+        # Components merged since, as a union-find forest over the labels
+        self.parents = list(range(count))
+
+    @classmethod
+    def load(cls, name):
+        """
+        Maps labels saved with save into memory. Processes mapping the same file share its pages.
+
+        Changes to the labels stay private to the index.
+        """
+        index = cls.__new__(cls)
+        labels = np.load(name, mmap_mode='c')
+        index.rows, index.columns = labels.shape
+        index.labels = labels.reshape(-1)
+        index.parents = list(range(int(labels.max()) + 1 if labels.size else 0))
+        return index
+
+    def save(self, name):
+        """ Saves the labels as a NumPy file, with the merged components resolved to their final label. """
+        roots = np.array([self.find(label) for label in range(len(self.parents))] + [-1], dtype=np.int32)
+        np.save(name, roots[self.labels].reshape(self.rows, self.columns))
+
+    def find(self, label):
+        """ Gets the label representing the component a label was merged into. """
+        parents = self.parents
+        while parents[label] != label:
+            parents[label] = parents[parents[label]]
+            label = parents[label]
+        return label
+
+    def new_label(self):
+        """ Creates the label of a new component. """
+        self.parents.append(len(self.parents))
+        return len(self.parents) - 1
+
+    def check(self, node):
+        """ Raises ValueError if a node (row, col) is outside the maze. """
+        if not (0 <= node[0] < self.rows and 0 <= node[1] < self.columns):
+            raise ValueError("Cell {} is outside the {}x{} maze".format(tuple(node), self.rows, self.columns))
+
+    def component(self, node):
+        """
+        Gets the component of a node (row, col), -1 if blocked.
+
+        Raises:
+            ValueError: If the node is outside the maze.
+        """
+        self.check(node)
+        label = int(self.labels[node[0] * self.columns + node[1]])
+        return self.find(label) if label >= 0 else -1
+
+    def connected(self, start, goal):
+        """ Checks whether there is a path between two cells, raising ValueError if one is outside the maze. """
+        component = self.component(start)
+        return component >= 0 and component == self.component(goal)
+
+    def reachable(self, starts, goals):
+        """
+        Checks many pairs of cells at once.
+
+        Args:
+            starts (sequence): Start cells (row, col).
+            goals (sequence): Goal cells (row, col), one for each start.
+
+        Returns:
+            numpy.ndarray: Whether there is a path between each start and its goal.
+
+        Raises:
+            ValueError: If a cell is outside the maze.
+        """
+        # Resolve merged labels
+        roots = np.array(self.parents, dtype=np.int32)
+        while True:
+            grandparents = roots[roots]
+            if np.array_equal(grandparents, roots):
+                break
+            roots = grandparents
+        starts = np.asarray(starts, dtype=np.int64).reshape(-1, 2)
+        goals = np.asarray(goals, dtype=np.int64).reshape(-1, 2)
+        for nodes in (starts, goals):
+            is_inside = (nodes >= 0).all(axis=1) & (nodes[:, 0] < self.rows) & (nodes[:, 1] < self.columns)
+            if not is_inside.all():
+                self.check(nodes[np.argmin(is_inside)].tolist())
+        start_labels = self.labels[starts[:, 0] * self.columns + starts[:, 1]]
+        goal_labels = self.labels[goals[:, 0] * self.columns + goals[:, 1]]
+        is_open = (start_labels >= 0) & (goal_labels >= 0)
+        return is_open & (roots[np.maximum(start_labels, 0)] == roots[np.maximum(goal_labels, 0)])
+
+    def neighbors(self, index):
+        """ Gets the flat indices of the open cells adjacent to a flat index. """
+        row, col = divmod(index, self.columns)
+        nodes = []
+        if row > 0:
+            nodes.append(index - self.columns)
+        if row < self.rows - 1:
+            nodes.append(index + self.columns)
+        if col > 0:
+            nodes.append(index - 1)
+        if col < self.columns - 1:
+            nodes.append(index + 1)
+        return [node for node in nodes if self.labels[node] >= 0]
+
+    def set_state(self, node, state):
+        """ Updates the components after the state of a node changed, raising ValueError if it is outside the maze. """
+        self.check(node)
+        index = node[0] * self.columns + node[1]
+        is_open = str(state) != STATE_BLOCKED
+        if is_open == (self.labels[index] >= 0):
+            return
+        neighbors = self.neighbors(index)
+        if is_open:
+            # Join the components around the cell
+            components = set(self.find(int(self.labels[nxt])) for nxt in neighbors)
+            label = components.pop() if components else self.new_label()
+            for component in components:
+                self.parents[component] = label
+            self.labels[index] = label
+        else:
+            self.labels[index] = -1
+            if len(neighbors) > 1:
+                self.split(neighbors)
+
+    def update(self, changes):
+        """
+        Applies changes to the maze.
+
+        Args:
+            changes (iterable): Pairs of cell (row, col) and its new state.
+        """
+        for node, state in changes:
+            self.set_state(node, state)
+
+    def split(self, sources):
+        """
+        Relabels the regions that became disconnected from each other after a cell was blocked.
+
+        A breadth-first search runs from every neighbor of the cell, one step each in turn. Searches
+        that meet are joined, and a group of searches that runs out of cells before all the others have
+        been joined covers a new component. The work done is proportional to the smaller regions.
+
+        Args:
+            sources (list): Flat indices of the open neighbors of the blocked cell.
+        """
+        owners = {source: search for search, source in enumerate(sources)}
+        frontiers = [deque([source]) for source in sources]
+        groups = list(range(len(sources)))
+
+        def group_of(search):
+            while groups[search] != search:
+                search = groups[search]
+            return search
+
+        active = set(groups)
+        while len(active) > 1:
+            for search, frontier in enumerate(frontiers):
+                group = group_of(search)
+                if group not in active:
+                    continue
+                if frontier:
+                    current = frontier.popleft()
+                    for nxt in self.neighbors(current):
+                        owner = owners.get(nxt)
+                        if owner is None:
+                            owners[nxt] = search
+                            frontier.append(nxt)
+                        elif group_of(owner) != group:
+                            other = group_of(owner)
+                            groups[other] = group
+                            active.discard(other)
+                elif not any(frontiers[other] for other in range(len(frontiers)) if group_of(other) == group):
+                    label = self.new_label()
+                    for cell, owner in owners.items():
+                        if group_of(owner) == group:
+                            self.labels[cell] = label
+                    active.discard(group)
+                if len(active) <= 1:
+                    break
@@ -0,0 +1,152 @@
+""" Compact recording of the events of a search. """
+import struct
+from array import array
+
+from .algorithms import solve
+from .grid import Grid
+
+
+# Kinds of events
+EXPAND = 0
+VISIT = 1
+PATH = 2
+
+# Trace file format: magic, version, reserved, rows, columns, events and keyframes, followed by
+# the keyframe offsets, the keyframe cells and the encoded events
+MAGIC = b"MZTR"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIQQ")
+
+# Number of events between two keyframes, where decoding can start
+KEYFRAME = 4096
+
+
+class Trace:
+    """
+    Sequence of search events stored in a few bytes each.
+
+    Every event is the change of cell index from the previous event, zigzag-encoded with its kind
+    in the two lowest bits and written as a variable-length integer.
+    """
+    def __init__(self, rows, columns):
+        """
+        Initializes an empty trace.
+
+        Args:
+            rows (int): Number of rows of the maze.
+            columns (int): Number of columns of the maze.
+        """
+        self.rows = int(rows)
+        self.columns = int(columns)
+        self.data = bytearray()
+        self.count = 0
+        self.previous = 0
+        self.keyframe_offsets = array('q')
+        self.keyframe_cells = array('q')
+
+    def __len__(self):
+        return self.count
+
+    def append(self, kind, node):
+        """ Records an event of a given kind at a node (row, col). """
+        if self.count % KEYFRAME == 0:
+            self.keyframe_offsets.append(len(self.data))
+            self.keyframe_cells.append(self.previous)
+        index = node[0] * self.columns + node[1]
+        delta = index - self.previous
+        self.previous = index
+        value = (((delta << 1) ^ (delta >> 63)) << 2) | kind
+        while value > 0x7f:
+            self.data.append((value & 0x7f) | 0x80)
+            value >>= 7
+        self.data.append(value)
+        self.count += 1
+
+    def expand(self, node):
+        """ Records the expansion of a node. """
+        self.append(EXPAND, node)
+
+    def visit(self, node):
+        """ Records a node added to the frontier. """
+        self.append(VISIT, node)
+
+    def path(self, nodes):
+        """ Records the nodes of the path found. """
+        for node in nodes:
+            self.append(PATH, node)
+
+    def events(self, start=0, stop=None):
+        """
+        Decodes events, starting from the nearest keyframe.
+
+        Args:
+            start (int, optional): Number of the first event. Defaults to 0.
+            stop (int, optional): Number of the event after the last one. Defaults to the end of the trace.
+
+        Yields:
+            tuple: Kind of event and node (row, col).
+        """
+        stop = self.count if stop is None else min(stop, self.count)
+        if start >= stop:
+            return
+        keyframe = start // KEYFRAME
+        number = keyframe * KEYFRAME
+        position = self.keyframe_offsets[keyframe]
+        index = self.keyframe_cells[keyframe]
+        data = self.data
+        while number < stop:
+            value = 0
+            shift = 0
+            while True:
+                byte = data[position]
+                position += 1
+                value |= (byte & 0x7f) << shift
+                shift += 7
+                if byte < 0x80:
+                    break
+            kind = value & 3
+            value >>= 2
+            index += (value >> 1) ^ -(value & 1)
+            if number >= start:
+                yield kind, divmod(index, self.columns)
+            number += 1
+
+    def save(self, name):
+        """ Saves trace as a binary file. """
+        with open(name, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, 0, self.rows, self.columns, self.count, len(self.keyframe_offsets)))
+            file.write(self.keyframe_offsets.tobytes())
+            file.write(self.keyframe_cells.tobytes())
+            file.write(self.data)
+
+    @classmethod
+    def load(cls, name):
+        """ Loads trace from a binary file. """
+        with open(name, 'rb') as file:
+            magic, version, _, rows, columns, count, keyframes = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("{} is not a version {} trace file".format(name, VERSION))
+            trace = cls(rows, columns)
+            trace.count = count
+            trace.keyframe_offsets.fromfile(file, keyframes)
+            trace.keyframe_cells.fromfile(file, keyframes)
+            trace.data = bytearray(file.read())
+        # Continue recording from the last event
+        for _, (row, col) in trace.events(max(count - 1, 0)):
+            trace.previous = row * columns + col
+        return trace
+
+
+def record(grid, start, goal, algorithm="a*", cost=1):
+    """
+    Finds a path as algorithms.solve does, recording the search.
+
+    Returns:
+        tuple: SearchResult and Trace of the search.
+    """
+    if not isinstance(grid, Grid):
+        grid = Grid.from_rows(grid)
+    trace = Trace(grid.rows, grid.columns)
+    result = solve(grid, start, goal, algorithm, cost, on_expand=trace.expand, on_visit=trace.visit)
+    trace.path(result.path)
+    return result, trace
@@ -0,0 +1,144 @@
+""" Scrollable and zoomable view of a maze larger than the window. """
+
+
+class Viewport:
+    """
+    Part of a maze shown in a window, with its zoom level.
+
+    The most detailed levels draw every cell as a tile separated by margins, halving the pitch
+    (pixels per cell) at each level down to one pixel per cell. Further levels are downsampled:
+    each pixel stands for a square block of cells whose side doubles at each level.
+    """
+    def __init__(self, rows, columns, width, margin, size):
+        """
+        Initializes the viewport, zoomed out just enough to show the whole maze.
+
+        Args:
+            rows (int): Number of rows of the maze.
+            columns (int): Number of columns of the maze.
+            width (int): Width of each cell at the most detailed level.
+            margin (int): Margin between cells at the most detailed level.
+            size (tuple): Width and height of the window in pixels.
+        """
+        self.rows = rows
+        self.columns = columns
+        self.width = width
+        self.margin = margin
+        self.size = size
+        self.top = 0
+        self.left = 0
+
+        # Pixels per cell of the detailed levels, then cells per pixel of the downsampled levels
+        self.pitches = []
+        pitch = width + margin
+        while pitch > 1:
+            self.pitches.append(pitch)
+            pitch //= 2
+        self.blocks = [1]
+        while self.blocks[-1] * size[0] < columns or self.blocks[-1] * size[1] < rows:
+            self.blocks.append(self.blocks[-1] * 2)
+        self.levels = len(self.pitches) + len(self.blocks)
+
+        self.level = 0
+        while self.level < self.levels - 1 and not self.fits():
+            self.level += 1
+
+    @property
+    def is_detailed(self):
+        """ Whether cells are drawn as separate tiles. """
+        return self.level < len(self.pitches)
+
+    @property
+    def pitch(self):
+        """ Pixels per cell, 1 if downsampled. """
+        return self.pitches[self.level] if self.is_detailed else 1
+
+    @property
+    def block(self):
+        """ Cells per pixel along each side, 1 if detailed. """
+        return 1 if self.is_detailed else self.blocks[self.level - len(self.pitches)]
+
+    @property
+    def cell_margin(self):
+        """ Margin between cells at the current level. """
+        return self.margin * self.pitch // (self.width + self.margin) if self.is_detailed else 0
+
+    @property
+    def cell_size(self):
+        """ Size of the tile of a cell at the current level. """
+        return self.pitch - self.cell_margin
+
+    def fits(self):
+        """ Checks whether the whole maze is visible. """
+        return self.cells(self.size[1]) >= self.rows and self.cells(self.size[0]) >= self.columns
+
+    def cells(self, pixels):
+        """ Gets the number of cells spanned by a number of pixels. """
+        return pixels * self.block // self.pitch
+
+    def visible(self):
+        """
+        Gets the cells in view.
+
+        Returns:
+            tuple: First and last (excluded) visible row, then first and last (excluded) visible column.
+        """
+        bottom = min(self.rows, self.top + self.cells(self.size[1]) + self.block)
+        right = min(self.columns, self.left + self.cells(self.size[0]) + self.block)
+        return self.top, bottom, self.left, right
+
+    def cell_at(self, position):
+        """ Gets the cell (row, col) under a pixel (x, y) of the window, None if outside the maze. """
+        row = self.top + (position[1] - self.cell_margin) // self.pitch * self.block
+        col = self.left + (position[0] - self.cell_margin) // self.pitch * self.block
+        if 0 <= row < self.rows and 0 <= col < self.columns:
+            return (row, col)
+        return None
+
+    def cell_rect(self, node):
+        """ Gets the rectangle (x, y, width, height) covering a cell in the window. """
+        size = self.cell_size if self.is_detailed else 1
+        x = (node[1] - self.left) // self.block * self.pitch + self.cell_margin
+        y = (node[0] - self.top) // self.block * self.pitch + self.cell_margin
+        return (x, y, size, size)
+
+    def scroll(self, rows, columns):
+        """ Moves the view by a number of cells, keeping it inside the maze. """
+        self.top += rows
+        self.left += columns
+        self.clamp()
+
+    def scroll_pixels(self, dx, dy):
+        """ Moves the view by a number of pixels, as when dragging the maze. """
+        self.scroll(-dy * self.block // self.pitch, -dx * self.block // self.pitch)
+
+    def zoom(self, steps, position=None):
+        """
+        Changes the zoom level, keeping the cell under a pixel in place.
+
+        Args:
+            steps (int): Levels to zoom in if positive, or out if negative.
+            position (tuple, optional): Pixel (x, y) to zoom around. Defaults to the center of the window.
+
+        Returns:
+            bool: Whether the level changed.
+        """
+        level = min(max(self.level - steps, 0), self.levels - 1)
+        if level == self.level:
+            return False
+        if position is None:
+            position = (self.size[0] // 2, self.size[1] // 2)
+        row = self.top + position[1] * self.block // self.pitch
+        col = self.left + position[0] * self.block // self.pitch
+        self.level = level
+        self.top = row - position[1] * self.block // self.pitch
+        self.left = col - position[0] * self.block // self.pitch
+        self.clamp()
+        return True
+
+    def clamp(self):
+        """ Keeps the view inside the maze, aligned with the blocks of cells when downsampled. """
+        self.top = max(0, min(self.top, self.rows - self.cells(self.size[1])))
+        self.left = max(0, min(self.left, self.columns - self.cells(self.size[0])))
+        self.top -= self.top % self.block
+        self.left -= self.left % self.block
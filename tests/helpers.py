@@ -0,0 +1,98 @@
+""" Seeded random mazes and reference solutions shared by the tests. """
+import heapq
+import os
+import random
+
+from pathfinding_algorithms.generators import obstacles
+
+
+# Root of the repository, where the visualizer finds its images
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def random_maze(seed, max_size=25, is_weighted=False):
+    """
+    Generates a random maze with two open cells to join.
+
+    Args:
+        seed (int): Seed of the random generator.
+        max_size (int, optional): Largest number of rows and columns. Defaults to 25.
+        is_weighted (bool, optional): Give half of the empty cells a random weight. Defaults to False.
+
+    Returns:
+        tuple: Grid, start cell and goal cell.
+    """
+    rng = random.Random(seed)
+    rows, columns = rng.randint(1, max_size), rng.randint(1, max_size)
+    grid = obstacles(rows, columns, rng.random() * 0.4, seed)
+    grid[0, 0] = '0'
+    grid[rows - 1, columns - 1] = '0'
+    if is_weighted:
+        for row in range(rows):
+            for col in range(columns):
+                if grid[row, col] == '0' and rng.random() < 0.5:
+                    grid[row, col] = str(rng.randint(1, 9))
+    start = (rng.randrange(rows), rng.randrange(columns))
+    goal = (rng.randrange(rows), rng.randrange(columns))
+    grid[start] = '0'
+    grid[goal] = '0'
+    return grid, start, goal
+
+
+def random_edits(grid, rng, count, keep=()):
+    """ Changes the state of random cells of a grid, except the kept ones, returning the changes. """
+    changes = []
+    for _ in range(count):
+        node = (rng.randrange(grid.rows), rng.randrange(grid.columns))
+        if node in keep:
+            continue
+        state = rng.choice("X0X0123456789")
+        grid[node] = state
+        changes.append((node, state))
+    return changes
+
+
+def weight(state):
+    """ Gets the weight of entering a cell of a given state. """
+    return int(state) if state in "123456789" else 1
+
+
+def reference_cost(grid, start, goal, cost=1):
+    """
+    Gets the cost of the cheapest path with a plain heap-based Dijkstra's algorithm over the grid,
+    independent of the package's solvers.
+
+    Returns:
+        int: Cost of the path, None if there is no path or an endpoint is blocked.
+    """
+    if grid[start] == 'X' or grid[goal] == 'X':
+        return None
+    distances = {start: 0}
+    frontier = [(0, start)]
+    while frontier:
+        distance, node = heapq.heappop(frontier)
+        if node == goal:
+            return distance * cost
+        if distance > distances[node]:
+            continue
+        row, col = node
+        for nxt in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if not (0 <= nxt[0] < grid.rows and 0 <= nxt[1] < grid.columns) or grid[nxt] == 'X':
+                continue
+            new_distance = distance + weight(grid[nxt])
+            if new_distance < distances.get(nxt, new_distance + 1):
+                distances[nxt] = new_distance
+                heapq.heappush(frontier, (new_distance, nxt))
+    return None
+
+
+def check_path(grid, result, start, goal, cost=1):
+    """ Checks that a path joins start and goal through adjacent open cells and costs what it claims. """
+    assert result.path[0] == start
+    assert result.path[-1] == goal
+    total = 0
+    for previous, current in zip(result.path, result.path[1:]):
+        assert abs(previous[0] - current[0]) + abs(previous[1] - current[1]) == 1
+        assert grid[current] != 'X'
+        total += weight(grid[current])
+    assert result.cost == total * cost
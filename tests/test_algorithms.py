@@ -0,0 +1,82 @@
+""" Costs of every algorithm against Dijkstra's algorithm on seeded random mazes. """
+import random
+
+import pytest
+
+from pathfinding_algorithms.algorithms import ALGORITHMS, solve
+from pathfinding_algorithms.generators import obstacles
+from pathfinding_algorithms.grid import Grid
+from pathfinding_algorithms.reachability import ReachabilityIndex
+
+from .helpers import check_path, random_maze, reference_cost
+
+
+# Algorithms returning the cheapest path on mazes without weights
+UNIFORM_OPTIMAL = ("bfs", "dijkstra", "a*")
+
+
+@pytest.mark.parametrize("algorithm", UNIFORM_OPTIMAL)
+def test_uniform_costs_match_dijkstra(algorithm):
+    for seed in range(150):
+        grid, start, goal = random_maze(seed)
+        expected = reference_cost(grid, start, goal)
+        result = solve(grid, start, goal, algorithm)
+        assert result.cost == expected, seed
+        if expected is not None:
+            check_path(grid, result, start, goal)
+
+
+@pytest.mark.parametrize("algorithm", ("dfs", "gbfs"))
+def test_suboptimal_paths_are_valid(algorithm):
+    for seed in range(100):
+        grid, start, goal = random_maze(seed, is_weighted=True)
+        result = solve(grid, start, goal, algorithm)
+        assert result.found == (reference_cost(grid, start, goal) is not None), seed
+        if result.found:
+            check_path(grid, result, start, goal)
+
+
+@pytest.mark.parametrize("algorithm", sorted(ALGORITHMS))
+def test_start_is_goal(algorithm):
+    grid = Grid(3, 4)
+    result = solve(grid, (1, 2), (1, 2), algorithm)
+    assert result.path == [(1, 2)]
+    assert result.cost == 0
+
+
+@pytest.mark.parametrize("algorithm", sorted(ALGORITHMS))
+def test_blocked_endpoint_has_no_path(algorithm):
+    grid = Grid.from_rows([list("X00"), list("000"), list("00X")])
+    for start, goal in (((0, 0), (1, 1)), ((1, 1), (2, 2)), ((0, 0), (2, 2))):
+        result = solve(grid, start, goal, algorithm)
+        assert result.path == []
+        assert result.cost is None
+
+
+@pytest.mark.parametrize("algorithm", sorted(ALGORITHMS))
+def test_endpoint_outside_maze(algorithm):
+    grid = Grid(4, 5)
+    for start, goal in (((0, 5), (3, 4)), ((0, 0), (4, 0)), ((-1, 2), (0, 0)), ((0, 0), (2, -1))):
+        with pytest.raises(ValueError):
+            solve(grid, start, goal, algorithm)
+
+
+@pytest.mark.parametrize("algorithm", sorted(ALGORITHMS))
+def test_solve_agrees_with_reachability(algorithm):
+    grid = obstacles(50, 60, 0.35, 11)
+    index = ReachabilityIndex(grid)
+    rng = random.Random(11)
+    for _ in range(50):
+        start = (rng.randrange(50), rng.randrange(60))
+        goal = (rng.randrange(50), rng.randrange(60))
+        result = solve(grid, start, goal, algorithm)
+        assert result.found == solve(grid, start, goal, algorithm, reachability=index).found
+        assert result.found == index.connected(start, goal)
+
+
+@pytest.mark.parametrize("algorithm", sorted(ALGORITHMS))
+def test_walled_goal_has_no_path(algorithm):
+    grid = Grid.from_rows([list("00X0"), list("00X0"), list("00X0")])
+    result = solve(grid, (0, 0), (2, 3), algorithm)
+    assert result.path == []
+    assert result.cost is None
@@ -0,0 +1,40 @@
+""" Batch solving on a pool of processes sharing the maze through mapped files. """
+import random
+
+from pathfinding_algorithms.algorithms import Layout
+from pathfinding_algorithms.batch import solve_many
+from pathfinding_algorithms.reachability import ReachabilityIndex
+
+from .helpers import random_edits, random_maze, reference_cost
+
+
+def test_batch_matches_solve():
+    grid, _, _ = random_maze(7, max_size=40)
+    queries = [random_maze(seed, max_size=min(grid.rows, grid.columns))[1:] for seed in range(40)]
+    queries = [(start, goal) for start, goal in queries if grid[start] != 'X' and grid[goal] != 'X']
+    results = {(start, goal): result for start, goal, result in solve_many(grid, queries, workers=2, chunk_size=8)}
+    assert len(results) == len(set(queries))
+    for start, goal in queries:
+        assert results[start, goal].cost == reference_cost(grid, start, goal)
+
+
+def test_layout_round_trip(tmp_path):
+    grid, _, _ = random_maze(4, max_size=30, is_weighted=True)
+    layout = Layout(grid)
+    name = str(tmp_path / "maze.weights")
+    layout.save(name)
+    loaded = Layout.load(name, grid.rows, grid.columns)
+    assert bytes(loaded.weights) == bytes(layout.weights)
+
+
+def test_reachability_round_trip(tmp_path):
+    grid, _, _ = random_maze(3, max_size=30)
+    index = ReachabilityIndex(grid)
+    index.update(random_edits(grid, random.Random(3), 10))
+    name = str(tmp_path / "labels.npy")
+    index.save(name)
+    loaded = ReachabilityIndex.load(name)
+    for row in range(grid.rows):
+        for col in range(grid.columns):
+            for other in ((0, 0), (grid.rows - 1, grid.columns - 1)):
+                assert loaded.connected((row, col), other) == index.connected((row, col), other)
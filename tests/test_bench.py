@@ -0,0 +1,25 @@
+""" Benchmark runs and their comparison with a baseline. """
+import pytest
+
+from pathfinding_algorithms.bench import compare, random_maze, run_benchmark
+
+
+def test_benchmarked_mazes_are_solvable():
+    results = run_benchmark([10, 100], [0.0, 0.1, 0.2, 0.3], ["bfs", "a*"], memory=False)
+    assert len(results) == 16
+    assert all(row["found"] for row in results)
+    for row in results:
+        _, seed = random_maze(row["size"], row["density"], row["seed"])
+        assert seed == row["seed"]
+
+
+def test_unsolvable_density():
+    with pytest.raises(ValueError):
+        random_maze(100, 0.7, 0)
+
+
+def test_compare_reports_regressions():
+    baseline = run_benchmark([10], [0.2], ["a*"], memory=False)
+    assert compare(baseline, baseline, 0.2) == []
+    slower = [dict(row, expanded=row["expanded"] * 2) for row in baseline]
+    assert len(compare(slower, baseline, 0.2)) == 1
@@ -0,0 +1,37 @@
+""" Bidirectional breadth-first search and A*. """
+import pytest
+
+from pathfinding_algorithms.algorithms import solve
+from pathfinding_algorithms.generators import kruskal, prim
+
+from .helpers import check_path, random_maze, reference_cost
+
+
+@pytest.mark.parametrize("algorithm", ("bidirectional-bfs", "bidirectional-a*"))
+def test_uniform_costs_match_reference(algorithm):
+    for seed in range(200):
+        grid, start, goal = random_maze(seed, max_size=40)
+        expected = reference_cost(grid, start, goal)
+        result = solve(grid, start, goal, algorithm)
+        assert result.cost == expected, seed
+        if expected is not None:
+            check_path(grid, result, start, goal)
+
+
+def test_weighted_costs_match_reference():
+    for seed in range(200):
+        grid, start, goal = random_maze(seed, is_weighted=True)
+        expected = reference_cost(grid, start, goal, cost=3)
+        result = solve(grid, start, goal, "bidirectional-a*", cost=3)
+        assert result.cost == expected, seed
+        if expected is not None:
+            check_path(grid, result, start, goal, cost=3)
+
+
+@pytest.mark.parametrize("generator", (kruskal, prim))
+def test_balanced_heuristic_expands_less_than_a_star(generator):
+    grid = generator(151, 151, 4)
+    forward = solve(grid, (0, 0), (150, 150), "a*")
+    both = solve(grid, (0, 0), (150, 150), "bidirectional-a*")
+    assert both.cost == forward.cost
+    assert both.expanded < forward.expanded
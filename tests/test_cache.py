@@ -0,0 +1,60 @@
+""" Cache of search results keyed by the content of the maze. """
+from pathfinding_algorithms.cache import PathCache, digest
+
+from .helpers import random_maze
+
+
+def test_cache_replays_callbacks(tmp_path):
+    grid, start, goal = random_maze(9, max_size=40)
+    cache = PathCache(name=str(tmp_path / "paths.cache"))
+    first, second = [], []
+    result = cache.solve(grid, start, goal, on_expand=first.append, on_visit=first.append)
+    assert cache.solve(grid, start, goal, on_expand=second.append, on_visit=second.append) is result
+    assert first == second
+    assert cache.stats()["hits"] == 1
+    cache.save()
+    assert PathCache(name=cache.name).solve(grid, start, goal).cost == result.cost
+
+
+def test_digest_follows_writes():
+    grid, _, _ = random_maze(10)
+    before = digest(grid)
+    grid[0, 0] = 'X' if grid[0, 0] != 'X' else '0'
+    assert digest(grid) != before
+    assert digest(grid) == digest(grid.copy())
+
+
+def test_least_recently_used_results_are_evicted():
+    grid, _, _ = random_maze(11, max_size=30)
+    cache = PathCache(max_size=2)
+    cache.solve(grid, (0, 0), (0, 0))
+    cache.solve(grid, (0, 0), (0, 0), "bfs")
+    cache.solve(grid, (0, 0), (0, 0))
+    cache.solve(grid, (0, 0), (0, 0), "dijkstra")
+    assert cache.stats() == {"size": 2, "hits": 1, "misses": 3, "evictions": 1}
+    cache.solve(grid, (0, 0), (0, 0))
+    assert cache.stats()["hits"] == 2
+
+
+def test_edits_invalidate_results():
+    grid, start, goal = random_maze(12)
+    cache = PathCache()
+    cache.solve(grid, start, goal)
+    before = digest(grid)
+    grid[start] = 'X'
+    assert cache.solve(grid, start, goal).cost is None
+    assert len(cache) == 2
+    cache.invalidate(before)
+    assert len(cache) == 1
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_results_without_trace_are_searched_again_with_callbacks():
+    grid, start, goal = random_maze(13, max_size=30)
+    cache = PathCache()
+    cache.solve(grid, start, goal)
+    expanded = []
+    result = cache.solve(grid, start, goal, on_expand=expanded.append)
+    assert len(expanded) == result.expanded
+    assert cache.stats()["misses"] == 2
@@ -0,0 +1,68 @@
+""" Solving maze files from the command line, one JSON line per maze. """
+import json
+
+from pathfinding_algorithms.cli import main
+from pathfinding_algorithms.generators import generate
+from pathfinding_algorithms.grid import Grid
+
+from .helpers import reference_cost
+
+
+def run(capsys, *args):
+    """ Runs the command line, returning its exit status and the records it wrote, sorted by maze. """
+    status = main(["solve"] + [str(arg) for arg in args])
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    return status, sorted(records, key=lambda record: record["maze"])
+
+
+def test_solves_every_maze_of_a_directory(tmp_path, capsys):
+    for seed in range(4):
+        generate(15, 21, "prim", seed, name=str(tmp_path / "maze{}.{}".format(seed, "maze" if seed % 2 else "txt")))
+    (tmp_path / "notes.md").write_text("not a maze")
+    status, records = run(capsys, tmp_path, "--algorithm", "Dijkstra's algorithm", "--workers", 1)
+    assert status == 0
+    assert [record["maze"] for record in records] == sorted(str(path) for path in tmp_path.glob("maze*"))
+    for record in records:
+        grid = Grid.load(record["maze"])
+        start, goal = tuple(record["start"]), tuple(record["goal"])
+        assert (grid[start], grid[goal]) == ('S', 'G')
+        assert record["algorithm"] == "dijkstra"
+        assert record["cost"] == reference_cost(grid, start, goal)
+        assert record["path"][0] == list(start) and record["path"][-1] == list(goal)
+        assert record["path_length"] == len(record["path"])
+
+
+def test_same_records_with_several_workers(tmp_path, capsys):
+    names = [str(tmp_path / "maze{}.txt".format(seed)) for seed in range(6)]
+    for seed, name in enumerate(names):
+        generate(11, 11, "obstacles", seed, density=0.2, name=name)
+    _, sequential = run(capsys, *names, "--workers", 1, "--no-path")
+    _, parallel = run(capsys, *names, "--workers", 2, "--no-path")
+    for record in sequential + parallel:
+        assert "path" not in record
+        del record["time"]
+    assert sequential == parallel
+
+
+def test_nearest_goal_and_stats(tmp_path, capsys):
+    name = tmp_path / "two_goals.txt"
+    name.write_text("S,0,0,G\n0,X,X,0\nG,0,0,0\n")
+    status, [record] = run(capsys, name, "--algorithm", "bfs", "--stats")
+    assert status == 0
+    assert (record["goal"], record["cost"]) == ([2, 0], 2)
+    assert record["stats"]["expanded"] == record["expanded"]
+
+
+def test_errors_are_recorded_without_stopping(tmp_path, capsys):
+    corrupt = tmp_path / "corrupt.maze"
+    corrupt.write_bytes(b"MAZE")
+    no_goal = tmp_path / "no_goal.txt"
+    no_goal.write_text("S,0\n0,0\n")
+    solvable = tmp_path / "solvable.txt"
+    solvable.write_text("S,0\nX,G\n")
+    missing = tmp_path / "missing.txt"
+    status, records = run(capsys, corrupt, no_goal, solvable, missing, "--workers", 1)
+    assert status == 1
+    assert [sorted(record) for record in records if "error" in record] == [["error", "maze"]] * 3
+    assert [record["maze"] for record in records if "error" not in record] == [str(solvable)]
+    assert records[3]["cost"] == 2
@@ -0,0 +1,58 @@
+""" Distance fields and Manhattan heuristics computed with NumPy. """
+import random
+
+import numpy as np
+
+from pathfinding_algorithms.distance import descend, distance_field, heuristic_grid, nearest_heuristic_grid
+
+from .helpers import random_maze, reference_cost
+
+
+def test_distance_field_matches_reference():
+    for seed in range(40):
+        grid, _, goal = random_maze(seed)
+        field = distance_field(grid, goal)
+        assert field.shape == (grid.rows, grid.columns)
+        for row in range(grid.rows):
+            for col in range(grid.columns):
+                expected = reference_cost(grid, (row, col), goal)
+                assert field[row, col] == (-1 if expected is None else expected), seed
+
+
+def test_distance_field_to_nearest_goal():
+    for seed in range(30):
+        grid, goal, other_goal = random_maze(seed)
+        field = distance_field(grid, [goal, other_goal])
+        fields = [distance_field(grid, goal), distance_field(grid, other_goal)]
+        unreached = np.iinfo(np.int32).max
+        expected = np.minimum(*[np.where(single < 0, unreached, single) for single in fields])
+        assert np.array_equal(field, np.where(expected == unreached, -1, expected)), seed
+
+
+def test_descend_follows_the_field():
+    for seed in range(40):
+        grid, start, goal = random_maze(seed)
+        field = distance_field(grid, goal)
+        path = descend(field, start)
+        if field[start] < 0:
+            assert path == []
+            continue
+        assert len(path) == field[start] + 1
+        assert path[0] == start and path[-1] == goal
+        for previous, current in zip(path, path[1:]):
+            assert abs(previous[0] - current[0]) + abs(previous[1] - current[1]) == 1
+            assert grid[current] != 'X'
+
+
+def test_heuristic_grids():
+    rng = random.Random(0)
+    for _ in range(20):
+        rows, columns = rng.randint(1, 20), rng.randint(1, 20)
+        goals = [(rng.randrange(rows), rng.randrange(columns)) for _ in range(rng.randint(1, 4))]
+        nearest = nearest_heuristic_grid(rows, columns, goals, cost=3)
+        single = heuristic_grid(rows, columns, goals[0], cost=3)
+        for row in range(rows):
+            for col in range(columns):
+                distances = [abs(row - goal[0]) + abs(col - goal[1]) for goal in goals]
+                assert single[row, col] == distances[0] * 3
+                assert nearest[row, col] == min(distances) * 3
@@ -0,0 +1,56 @@
+""" Shape of the mazes built by every generator, and their seeds. """
+import pytest
+
+from pathfinding_algorithms.generators import GENERATORS, generate, obstacles
+from pathfinding_algorithms.grid import Grid
+from pathfinding_algorithms.reachability import ReachabilityIndex
+
+
+# Generators of mazes where every pair of rooms is joined by exactly one path
+PERFECT = ("backtracker", "kruskal", "prim")
+
+
+@pytest.mark.parametrize("method", PERFECT)
+@pytest.mark.parametrize("rows, columns", ((2, 4), (1, 9), (7, 1), (5, 7), (31, 41), (8, 10)))
+def test_perfect_maze_is_a_tree(method, rows, columns):
+    for seed in range(5):
+        grid = generate(rows, columns, method, seed)
+        open_cells = [(row, col) for row in range(rows) for col in range(columns) if grid[row, col] != 'X']
+        rooms = [(row, col) for row in range(0, rows, 2) for col in range(0, columns, 2)]
+        # A tree over the rooms opens one wall less than its rooms, so it has no cycles
+        assert len(open_cells) == 2 * len(rooms) - 1, seed
+        index = ReachabilityIndex(grid)
+        assert all(index.connected((0, 0), node) for node in open_cells), seed
+        assert grid[0, 0] == 'S'
+        assert grid[rooms[-1]] == 'G'
+        # The last row or column stays blocked with an even number of them
+        if rows % 2 == 0:
+            assert grid.row(rows - 1) == b'X' * columns
+        if columns % 2 == 0:
+            assert all(grid[row, columns - 1] == 'X' for row in range(rows))
+
+
+@pytest.mark.parametrize("method", sorted(GENERATORS))
+def test_same_seed_gives_same_maze(method):
+    mazes = [generate(21, 33, method, seed).tobytes() for seed in (4, 4, 5)]
+    assert mazes[0] == mazes[1]
+    assert mazes[0] != mazes[2]
+
+
+def test_obstacles_density():
+    grid = obstacles(200, 300, 0.25, 3)
+    blocked = grid.tobytes().count(b'X')
+    assert abs(blocked / (200 * 300) - 0.25) < 0.01
+    assert (grid[0, 0], grid[199, 299]) == ('S', 'G')
+    assert obstacles(10, 10, 0.0, 3).tobytes().count(b'X') == 0
+
+
+def test_generated_maze_is_saved(tmp_path):
+    name = str(tmp_path / "generated.maze")
+    grid = generate(15, 17, "kruskal", 2, name=name)
+    assert Grid.load(name).tobytes() == grid.tobytes()
+
+
+def test_unknown_generator():
+    with pytest.raises(ValueError):
+        generate(5, 5, "eller")
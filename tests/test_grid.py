@@ -0,0 +1,54 @@
+""" Compact grid and its text and binary file formats. """
+import pytest
+
+from pathfinding_algorithms.grid import Grid
+
+from .helpers import random_maze
+
+
+@pytest.mark.parametrize("extension", (".txt", ".maze"))
+def test_grid_round_trip(tmp_path, extension):
+    grid, start, goal = random_maze(5, max_size=40, is_weighted=True)
+    grid[start] = 'S'
+    grid[goal] = 'G'
+    name = str(tmp_path / ("maze" + extension))
+    grid.save(name)
+    loaded = Grid.load(name)
+    assert (loaded.rows, loaded.columns) == (grid.rows, grid.columns)
+    assert loaded.tobytes() == grid.tobytes()
+    assert loaded.to_rows() == grid.to_rows()
+
+
+def test_binary_save_over_mapped_file(tmp_path):
+    name = str(tmp_path / "maze.maze")
+    grid, _, _ = random_maze(6, max_size=40)
+    grid.save(name)
+    mapped = Grid.load(name)
+    mapped[0, 0] = 'S'
+    mapped.save(name)
+    assert mapped[0, 0] == 'S'
+    assert Grid.load(name).tobytes() == mapped.tobytes()
+
+
+def test_text_rows_must_match(tmp_path):
+    name = tmp_path / "maze.txt"
+    name.write_text("0,0,0\n0,0\n")
+    with pytest.raises(ValueError):
+        Grid.load(str(name))
+
+
+@pytest.mark.parametrize("content", (b"", b"MA", b"MAZE\x01\x00"))
+def test_short_binary_file(tmp_path, content):
+    name = tmp_path / "maze.maze"
+    name.write_bytes(content)
+    with pytest.raises(ValueError):
+        Grid.load(str(name))
+
+
+def test_truncated_binary_body(tmp_path):
+    name = str(tmp_path / "maze.maze")
+    Grid(4, 5).save(name)
+    with open(name, 'r+b') as file:
+        file.truncate(30)
+    with pytest.raises(ValueError):
+        Grid.load(name)
@@ -0,0 +1,40 @@
+""" Hierarchical pathfinding over clusters of the maze. """
+import pytest
+
+from pathfinding_algorithms.hierarchical import HierarchicalMap
+
+from .helpers import check_path, random_maze, reference_cost
+
+
+@pytest.mark.parametrize("cluster_size", (3, 5, 16))
+def test_paths_are_valid_and_agree_on_reachability(cluster_size):
+    for seed in range(60):
+        grid, start, goal = random_maze(seed, max_size=40, is_weighted=seed % 2 == 1)
+        hierarchical_map = HierarchicalMap(grid, cluster_size)
+        expected = reference_cost(grid, start, goal, cost=2)
+        result = hierarchical_map.solve(start, goal, cost=2)
+        assert result.found == (expected is not None), seed
+        if result.found:
+            check_path(grid, result, start, goal, cost=2)
+            assert result.cost >= expected
+
+
+def test_blocked_endpoint_has_no_path():
+    grid, start, goal = random_maze(3, max_size=30)
+    grid[goal] = 'X'
+    result = HierarchicalMap(grid, 4).solve(start, goal)
+    assert result.path == []
+    assert result.cost is None
+
+
+def test_save_and_load(tmp_path):
+    grid, start, goal = random_maze(5, max_size=40)
+    hierarchical_map = HierarchicalMap(grid, 8)
+    name = str(tmp_path / "maze.hpa")
+    hierarchical_map.save(name)
+    loaded = HierarchicalMap.load(name, grid)
+    assert loaded.edges == hierarchical_map.edges
+    assert loaded.solve(start, goal).path == hierarchical_map.solve(start, goal).path
+    grid[start] = 'X' if grid[start] != 'X' else '0'
+    with pytest.raises(ValueError):
+        HierarchicalMap.load(name, grid)
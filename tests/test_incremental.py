@@ -0,0 +1,57 @@
+""" Incremental planner kept up to date through edits of the maze. """
+import random
+
+import pytest
+
+from pathfinding_algorithms.incremental import IncrementalPlanner
+
+from .helpers import ROOT, check_path, random_edits, random_maze, reference_cost
+
+
+def test_planner_matches_dijkstra_after_edits():
+    for seed in range(80):
+        rng = random.Random(seed)
+        grid, start, goal = random_maze(seed, is_weighted=True)
+        planner = IncrementalPlanner(grid, start, goal)
+        for _ in range(4):
+            result = planner.plan()
+            expected = reference_cost(grid, planner.start, goal)
+            assert result.cost == expected, seed
+            if expected is not None:
+                check_path(grid, result, planner.start, goal)
+            planner.update(random_edits(grid, rng, rng.randint(1, 6), keep=(planner.start, goal)))
+
+
+def test_planner_follows_moved_start():
+    for seed in range(40):
+        grid, start, goal = random_maze(seed)
+        planner = IncrementalPlanner(grid, start, goal)
+        result = planner.plan()
+        if len(result.path) < 3:
+            continue
+        planner.move(result.path[len(result.path) // 2])
+        moved = planner.plan()
+        assert moved.path[0] == planner.start
+        assert moved.cost == reference_cost(grid, planner.start, goal)
+
+
+def test_planner_follows_editor_changes(monkeypatch):
+    pytest.importorskip("pygame")
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.chdir(ROOT)
+    from pathfinding_algorithms.maze import MazeWindow
+
+    for seed in range(30):
+        rng = random.Random(seed)
+        grid, start, goal = random_maze(seed, is_weighted=True)
+        window = MazeWindow(grid.rows, grid.columns)
+        window.grid = grid
+        planner = IncrementalPlanner(grid, start, goal)
+        planner.plan()
+        for _ in range(grid.rows * grid.columns // 4):
+            node = (rng.randrange(grid.rows), rng.randrange(grid.columns))
+            if node not in (start, goal):
+                window.edit_node(node, rng.choice("X019SG"))
+        planner.update(window.edited_nodes)
+        assert planner.plan().cost == reference_cost(window.grid, start, goal), seed
+
@@ -0,0 +1,46 @@
+""" Jump point search on uniform-cost mazes. """
+from pathfinding_algorithms.algorithms import solve
+from pathfinding_algorithms.generators import kruskal, obstacles
+from pathfinding_algorithms.grid import Grid
+
+from .helpers import check_path, random_maze, reference_cost
+
+
+def test_costs_match_reference():
+    for seed in range(300):
+        grid, start, goal = random_maze(seed, max_size=40)
+        expected = reference_cost(grid, start, goal)
+        result = solve(grid, start, goal, "jps")
+        assert result.cost == expected, seed
+        if expected is not None:
+            check_path(grid, result, start, goal)
+
+
+def test_sparse_and_perfect_mazes():
+    for seed in range(10):
+        for grid in (obstacles(60, 70, 0.05 * (seed % 4), seed), kruskal(41, 61, seed)):
+            start, goal = (0, 0), (grid.rows - 1, grid.columns - 1)
+            if grid[goal] == 'X':
+                goal = (grid.rows - 2, grid.columns - 2)
+            result = solve(grid, start, goal, "jps")
+            assert result.cost == reference_cost(grid, start, goal), seed
+            if result.found:
+                check_path(grid, result, start, goal)
+
+
+def test_open_maze_expands_few_jump_points():
+    grid = Grid(300, 200)
+    for start, goal in (((0, 0), (299, 199)), ((150, 0), (150, 199)), ((0, 100), (299, 100)), ((299, 199), (0, 0))):
+        result = solve(grid, start, goal, "jps")
+        check_path(grid, result, start, goal)
+        assert result.cost == abs(start[0] - goal[0]) + abs(start[1] - goal[1])
+        assert result.expanded <= 3
+
+
+def test_weighted_maze_falls_back_to_a_star():
+    for seed in range(50):
+        grid, start, goal = random_maze(seed, is_weighted=True)
+        result = solve(grid, start, goal, "jps", cost=2)
+        assert result.cost == reference_cost(grid, start, goal, cost=2), seed
+        if result.found:
+            check_path(grid, result, start, goal, cost=2)
@@ -0,0 +1,82 @@
+""" Drawing state of the visualizer, run without a display. """
+import time
+
+import pytest
+
+from .helpers import ROOT
+
+
+@pytest.fixture
+def window(monkeypatch):
+    """ Opens a 200x300 maze window on the dummy video driver. """
+    pygame = pytest.importorskip("pygame")
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.chdir(ROOT)
+    from pathfinding_algorithms.maze import MazeWindow
+
+    maze_window = MazeWindow(rows=200, columns=300, width=1, margin=0)
+    maze_window.open_window()
+    yield maze_window
+    pygame.quit()
+
+
+def test_clear_maze_lists_few_changed_cells(window):
+    window.grid_backup = window.grid.copy()
+    window.set_node((3, 4), window.state_explored)
+    window.draw_grid()
+    window.set_node((5, 6), window.state_visited)
+    window.clear_maze()
+    assert window.dirty_nodes == {(3, 4), (5, 6)}
+    assert not window.is_dirty
+    assert window.grid[3, 4] == window.grid[5, 6] == '0'
+
+
+def test_clear_maze_marks_whole_view_after_large_search(window):
+    window.grid_backup = window.grid.copy()
+    window.grid.cells[:] = window.state_explored.encode() * len(window.grid.cells)
+    window.clear_maze()
+    assert window.is_dirty
+    assert not window.dirty_nodes
+    assert window.grid.tobytes() == window.grid_backup.tobytes()
+    window.draw_grid()
+    assert not window.is_dirty
+
+
+def run_frames(window, monkeypatch, is_done, *args):
+    """ Runs a search in the window, closing it on the first frame where a condition holds. """
+    import pygame
+
+    def get():
+        return [pygame.event.Event(pygame.QUIT)] if is_done() else []
+
+    monkeypatch.setattr(pygame.event, "get", get)
+    window.run(False, *args)
+
+
+def test_full_event_buffer_blocks_solver_until_closed(window, monkeypatch):
+    from pathfinding_algorithms import maze
+
+    monkeypatch.setattr(maze, "EVENT_BUFFER", 100)
+    window.grid[0, 0] = window.state_start
+    window.grid[199, 299] = window.state_goal
+    window.fps = 0
+    deadline = time.monotonic() + 10
+    sizes = []
+
+    def is_full():
+        sizes.append(window.events.qsize())
+        return sizes[-1] == 100 or time.monotonic() > deadline
+
+    run_frames(window, monkeypatch, is_full, "dijkstra")
+    assert max(sizes) == 100
+    assert window.result is None and window.error is None
+
+
+def test_failed_search_is_reported_after_closing(window, monkeypatch, tmp_path):
+    window.grid[0, 0] = window.state_start
+    window.fps = 0
+    name = tmp_path / "search.trace"
+    with pytest.raises(RuntimeError):
+        run_frames(window, monkeypatch, lambda: window.error is not None, "dijkstra", str(name))
+    assert not name.exists()
+    assert window.grid[0, 0] == window.state_start
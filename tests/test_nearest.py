@@ -0,0 +1,42 @@
+""" Searches from several starts to the nearest of several goals at once. """
+import pytest
+
+from pathfinding_algorithms.grid import Grid
+from pathfinding_algorithms.nearest import solve_nearest, supports_nearest
+
+from .helpers import check_path, random_maze, reference_cost
+
+
+@pytest.mark.parametrize("algorithm", ("bfs", "dijkstra", "a*"))
+def test_nearest_matches_best_pair(algorithm):
+    for seed in range(60):
+        grid, start, goal = random_maze(seed, is_weighted=algorithm != "bfs")
+        _, other_start, other_goal = random_maze(seed + 1000, max_size=min(grid.rows, grid.columns))
+        grid[other_start] = '0'
+        grid[other_goal] = '0'
+        starts, goals = [start, other_start], [goal, other_goal]
+        costs = [reference_cost(grid, a, b) for a in starts for b in goals]
+        costs = [value for value in costs if value is not None]
+        result = solve_nearest(grid, starts, goals, algorithm)
+        assert result.cost == (min(costs) if costs else None), seed
+        if result.found:
+            assert result.start in starts and result.goal in goals
+            check_path(grid, result, result.start, result.goal)
+
+
+def test_nearest_ignores_blocked_endpoints():
+    grid = Grid.from_rows([list("X00"), list("000"), list("00X")])
+    result = solve_nearest(grid, [(0, 0), (1, 0)], [(2, 2), (2, 1)])
+    assert (result.start, result.goal, result.cost) == ((1, 0), (2, 1), 2)
+    assert solve_nearest(grid, [(0, 0)], [(1, 1), (2, 1)]).cost is None
+    with pytest.raises(ValueError):
+        solve_nearest(grid, [(0, 1)], [(1, 1), (3, 1)])
+
+
+def test_unsupported_algorithms():
+    grid = Grid(3, 3)
+    assert supports_nearest("Dijkstra's algorithm") and supports_nearest("A*")
+    for algorithm in ("dfs", "gbfs", "jps"):
+        assert not supports_nearest(algorithm)
+        with pytest.raises(ValueError):
+            solve_nearest(grid, [(0, 0)], [(2, 2)], algorithm)
@@ -0,0 +1,44 @@
+""" Connected components of the open cells, checked against searches and rebuilt indexes. """
+import random
+
+import numpy as np
+import pytest
+
+from pathfinding_algorithms.grid import Grid
+from pathfinding_algorithms.reachability import ReachabilityIndex
+
+from .helpers import random_edits, random_maze, reference_cost
+
+
+def test_reachability_matches_rebuild_after_edits():
+    for seed in range(80):
+        rng = random.Random(seed)
+        grid, _, _ = random_maze(seed)
+        index = ReachabilityIndex(grid)
+        for _ in range(5):
+            index.update(random_edits(grid, rng, rng.randint(1, 8)))
+            rebuilt = ReachabilityIndex(grid)
+            nodes = [(row, col) for row in range(grid.rows) for col in range(grid.columns)]
+            pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(50)]
+            for start, goal in pairs:
+                assert index.connected(start, goal) == rebuilt.connected(start, goal), seed
+                if grid[start] != 'X' and grid[goal] != 'X':
+                    assert index.connected(start, goal) == (reference_cost(grid, start, goal) is not None), seed
+            starts, goals = zip(*pairs)
+            assert np.array_equal(index.reachable(starts, goals), rebuilt.reachable(starts, goals))
+
+
+def test_cells_outside_maze():
+    index = ReachabilityIndex(Grid(4, 5))
+    for node in ((4, 0), (0, 5), (-1, 2), (2, -1)):
+        with pytest.raises(ValueError):
+            index.component(node)
+        with pytest.raises(ValueError):
+            index.connected((0, 0), node)
+        with pytest.raises(ValueError):
+            index.reachable([(0, 0), node], [(3, 4), (3, 4)])
+        with pytest.raises(ValueError):
+            index.reachable([(0, 0)], [node])
+        with pytest.raises(ValueError):
+            index.set_state(node, "X")
+    assert index.reachable([(0, 0), (3, 0)], [(3, 4), (0, 4)]).all()
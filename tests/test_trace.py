@@ -0,0 +1,36 @@
+""" Search traces recorded, saved, loaded and read back from any event. """
+from pathfinding_algorithms.trace import EXPAND, KEYFRAME, PATH, VISIT, Trace, record
+
+from .helpers import random_maze
+
+
+def test_trace_round_trip(tmp_path):
+    grid, start, goal = random_maze(8, max_size=60)
+    result, trace = record(grid, start, goal, "dijkstra")
+    name = str(tmp_path / "search.trace")
+    trace.save(name)
+    loaded = Trace.load(name)
+    assert (loaded.rows, loaded.columns, len(loaded)) == (grid.rows, grid.columns, len(trace))
+    assert list(loaded.events()) == list(trace.events())
+    assert [node for kind, node in loaded.events() if kind == PATH] == result.path
+    assert sum(1 for kind, _ in loaded.events() if kind == EXPAND) == result.expanded
+
+
+def test_trace_events_across_keyframes():
+    trace = Trace(300, 200)
+    events = [((index * 7919) % 3 % 2, divmod((index * 7919) % 60000, 200)) for index in range(3 * KEYFRAME + 5)]
+    for kind, node in events:
+        trace.append(kind, node)
+    for start, stop in ((0, 10), (KEYFRAME - 3, KEYFRAME + 3), (2 * KEYFRAME, 3 * KEYFRAME + 5), (100, 100)):
+        assert list(trace.events(start, stop)) == events[start:stop]
+
+
+def test_loaded_trace_keeps_recording(tmp_path):
+    trace = Trace(10, 10)
+    trace.visit((2, 3))
+    trace.expand((9, 9))
+    name = str(tmp_path / "search.trace")
+    trace.save(name)
+    loaded = Trace.load(name)
+    loaded.expand((0, 1))
+    assert list(loaded.events()) == [(VISIT, (2, 3)), (EXPAND, (9, 9)), (EXPAND, (0, 1))]
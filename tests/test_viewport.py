@@ -0,0 +1,101 @@
+""" Scrolling, zooming and mapping between cells and pixels of the view of a large maze. """
+import pytest
+
+from pathfinding_algorithms.viewport import Viewport
+
+
+def large_viewport():
+    """ Creates the view of a maze far larger than its 800x600 window. """
+    return Viewport(5000, 3000, 20, 2, (800, 600))
+
+
+def test_small_maze_is_shown_in_detail():
+    viewport = Viewport(10, 12, 20, 2, (400, 300))
+    assert (viewport.level, viewport.pitch, viewport.cell_size, viewport.block) == (0, 22, 20, 1)
+    assert viewport.fits()
+    assert viewport.visible() == (0, 10, 0, 12)
+
+
+def test_large_maze_starts_zoomed_out_to_fit():
+    viewport = large_viewport()
+    assert viewport.level == viewport.levels - 1
+    assert not viewport.is_detailed
+    assert viewport.fits()
+    assert viewport.block * 600 >= 5000 and viewport.block * 800 >= 3000
+    assert viewport.visible() == (0, 5000, 0, 3000)
+
+
+def test_levels_halve_pitch_then_double_blocks():
+    viewport = large_viewport()
+    shown = []
+    while True:
+        shown.append((viewport.pitch, viewport.block))
+        if not viewport.zoom(1):
+            break
+    assert shown[::-1] == [(22, 1), (11, 1), (5, 1), (2, 1), (1, 1), (1, 2), (1, 4), (1, 8), (1, 16)]
+    assert viewport.level == 0
+    assert not viewport.zoom(1)
+
+
+@pytest.mark.parametrize("level", range(9))
+def test_cell_at_and_cell_rect_agree(level):
+    viewport = large_viewport()
+    viewport.level = level
+    viewport.scroll(1234, 567)
+    top, bottom, left, right = viewport.visible()
+    for row in range(top, bottom, max(1, (bottom - top) // 17)):
+        for col in range(left, right, max(1, (right - left) // 13)):
+            x, y, width, height = viewport.cell_rect((row, col))
+            if x >= 800 or y >= 600:
+                continue
+            assert width == height == viewport.cell_size
+            corner = (row - row % viewport.block, col - col % viewport.block)
+            assert viewport.cell_at((x, y)) == corner
+            assert viewport.cell_at((x + width - 1, y + height - 1)) == corner
+
+
+def test_cell_at_outside_maze():
+    viewport = Viewport(10, 12, 20, 2, (400, 300))
+    assert viewport.cell_at((0, 0)) is None
+    assert viewport.cell_at((5, 0)) is None
+    assert viewport.cell_at((0, 5)) is None
+    assert viewport.cell_at((2, 2)) == (0, 0)
+    assert viewport.cell_at((12 * 22 + 2, 5)) is None
+    assert viewport.cell_at((5, 10 * 22 + 2)) is None
+
+
+def test_zoom_keeps_cell_under_pointer():
+    viewport = large_viewport()
+    viewport.level = 2
+    viewport.scroll(2000, 1000)
+    position = (300, 200)
+    before = viewport.cell_at(position)
+    assert viewport.zoom(-1, position)
+    assert viewport.pitch == 2
+    assert abs(viewport.cell_at(position)[0] - before[0]) <= 1
+    assert abs(viewport.cell_at(position)[1] - before[1]) <= 1
+    assert viewport.zoom(1, position)
+    assert viewport.cell_at(position) == before
+
+
+def test_clamp_keeps_view_inside_maze_and_aligned():
+    viewport = large_viewport()
+    viewport.level = 5
+    viewport.scroll(-100, -100)
+    assert (viewport.top, viewport.left) == (0, 0)
+    viewport.scroll(10 ** 6, 10 ** 6)
+    top, bottom, left, right = viewport.visible()
+    assert (bottom, right) == (5000, 3000)
+    assert top == 5000 - 600 * 2 and left == 3000 - 800 * 2
+    viewport.level = 7
+    viewport.top, viewport.left = 1003, 1001
+    viewport.clamp()
+    assert (viewport.top % 8, viewport.left % 8) == (0, 0)
+
+
+def test_scroll_pixels_drags_maze():
+    viewport = large_viewport()
+    viewport.level = 0
+    viewport.scroll(100, 100)
+    viewport.scroll_pixels(-44, 66)
+    assert (viewport.top, viewport.left) == (97, 102)
@@ -0,0 +1,53 @@
+""" Weighted cells searched by the bucket-queue Dijkstra's algorithm and A*. """
+import pytest
+
+from pathfinding_algorithms.algorithms import solve
+from pathfinding_algorithms.grid import Grid
+
+from .helpers import check_path, random_maze, reference_cost
+
+
+# Algorithms returning the cheapest path on any maze
+OPTIMAL = ("dijkstra", "a*")
+
+
+@pytest.mark.parametrize("algorithm", OPTIMAL)
+@pytest.mark.parametrize("cost", (1, 3, 250))
+def test_weighted_costs_match_dijkstra(algorithm, cost):
+    for seed in range(150):
+        grid, start, goal = random_maze(seed, is_weighted=True)
+        expected = reference_cost(grid, start, goal, cost=cost)
+        result = solve(grid, start, goal, algorithm, cost=cost)
+        assert result.cost == expected, seed
+        if expected is not None:
+            check_path(grid, result, start, goal, cost=cost)
+
+
+@pytest.mark.parametrize("algorithm", OPTIMAL)
+def test_heaviest_cells_everywhere(algorithm):
+    grid = Grid.from_rows([list("9" * 40) for _ in range(30)])
+    result = solve(grid, (0, 0), (29, 39), algorithm, cost=7)
+    assert result.cost == (29 + 39) * 9 * 7
+    check_path(grid, result, (0, 0), (29, 39), cost=7)
+
+
+@pytest.mark.parametrize("algorithm", OPTIMAL)
+def test_detour_around_heavy_cells(algorithm):
+    grid = Grid.from_rows([list("0999990"), list("0XXXXX0"), list("0000000")])
+    result = solve(grid, (0, 0), (0, 6), algorithm)
+    assert result.cost == 10
+    assert (1, 0) in result.path
+    grid[2, 3] = '9'
+    assert solve(grid, (0, 0), (0, 6), algorithm).cost == 18
+    assert solve(grid, (0, 0), (0, 6), "bfs").cost == 46
+
+
+def test_weights_survive_both_file_formats(tmp_path):
+    grid, start, goal = random_maze(5, max_size=40, is_weighted=True)
+    expected = solve(grid, start, goal, "dijkstra").cost
+    for name in ("weighted.txt", "weighted.maze"):
+        path = str(tmp_path / name)
+        grid.save(path)
+        loaded = Grid.load(path)
+        assert loaded.tobytes() == grid.tobytes()
+        assert solve(loaded, start, goal, "dijkstra").cost == expected